@@ -5,22 +5,90 @@ Handles alert storage, checking, and comparison logic.
 
 import json
 import logging
+import re
 import asyncio
+from bisect import bisect_left
+from dataclasses import replace
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from pathlib import Path
 
-from .models import PriceAlert, AlertType, AlertStatus
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from .models import PriceAlert, AlertType, AlertStatus, normalize_symbol
 from .groww_client import GrowwClient
 from .market_utils import (
     should_monitor_alerts, get_monitoring_interval, get_market_status,
-    is_market_hours, get_ist_now
+    is_market_hours, get_ist_now, next_action
 )
 from .email_service import EmailService
-from .email_config import email_config_manager
+from .email_config import email_config_manager, EmailConfig
 
 logger = logging.getLogger(__name__)
 
+# orjson decodes/encodes much faster than the stdlib json module when present
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Fallback patterns for natural-language alert commands, compiled once
+_STOCK_RE = re.compile(r'\b([A-Z]{2,}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b')
+_PERCENTAGE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+_PRICE_RE = re.compile(r'(?:₹|Rs\.?\s*)?(\d+(?:\.\d+)?)')
+
+# Capitalized words in alert commands that are never stock names
+_COMMON_WORDS = frozenset({'SET', 'ALERT', 'FOR', 'IF', 'IT', 'GOES', 'UP',
+                           'DOWN', 'BY', 'WHEN', 'ABOVE', 'BELOW', 'ME', 'THE', 'A', 'AND', 'OR'})
+
+# Flexible mapping for various ways to express alert types
+_ALERT_TYPE_MAPPINGS = {
+    # Percentage increase
+    'percentage_increase': AlertType.PERCENTAGE_INCREASE,
+    'percent_increase': AlertType.PERCENTAGE_INCREASE,
+    'percentage_up': AlertType.PERCENTAGE_INCREASE,
+    'percent_up': AlertType.PERCENTAGE_INCREASE,
+    'up_by_percent': AlertType.PERCENTAGE_INCREASE,
+    'increase_by_percent': AlertType.PERCENTAGE_INCREASE,
+    'rise_by_percent': AlertType.PERCENTAGE_INCREASE,
+
+    # Percentage decrease
+    'percentage_decrease': AlertType.PERCENTAGE_DECREASE,
+    'percent_decrease': AlertType.PERCENTAGE_DECREASE,
+    'percentage_down': AlertType.PERCENTAGE_DECREASE,
+    'percent_down': AlertType.PERCENTAGE_DECREASE,
+    'down_by_percent': AlertType.PERCENTAGE_DECREASE,
+    'decrease_by_percent': AlertType.PERCENTAGE_DECREASE,
+    'fall_by_percent': AlertType.PERCENTAGE_DECREASE,
+    'drop_by_percent': AlertType.PERCENTAGE_DECREASE,
+
+    # Price above
+    'price_above': AlertType.PRICE_ABOVE,
+    'above_price': AlertType.PRICE_ABOVE,
+    'price_over': AlertType.PRICE_ABOVE,
+    'over_price': AlertType.PRICE_ABOVE,
+    'price_exceeds': AlertType.PRICE_ABOVE,
+    'exceeds_price': AlertType.PRICE_ABOVE,
+    'price_crosses_up': AlertType.PRICE_ABOVE,
+    'goes_above': AlertType.PRICE_ABOVE,
+
+    # Price below
+    'price_below': AlertType.PRICE_BELOW,
+    'below_price': AlertType.PRICE_BELOW,
+    'price_under': AlertType.PRICE_BELOW,
+    'under_price': AlertType.PRICE_BELOW,
+    'price_falls_below': AlertType.PRICE_BELOW,
+    'falls_below': AlertType.PRICE_BELOW,
+    'price_crosses_down': AlertType.PRICE_BELOW,
+    'goes_below': AlertType.PRICE_BELOW,
+
+    # Volume alerts
+    'volume_above': AlertType.VOLUME_ABOVE,
+    'volume_over': AlertType.VOLUME_ABOVE,
+    'high_volume': AlertType.VOLUME_ABOVE,
+}
+
 
 class AlertManager:
     """Manages price alerts for stocks."""
@@ -29,17 +97,39 @@ class AlertManager:
         self.groww_client = groww_client
         self.alerts_file = Path(alerts_file)
         self.alerts: List[PriceAlert] = []
+        # ID index for O(1) exact and O(log n) prefix lookups, see _reindex()
+        self._by_id: Dict[str, PriceAlert] = {}
+        self._sorted_ids: List[str] = []
         self.monitoring_task: Optional[asyncio.Task] = None
         self.monitoring_interval = 180  # Default 3 minutes, will be dynamic
         self.email_service: Optional[EmailService] = None
+        self.email_enabled = False
         self.load_alerts()
         self._initialize_email_service()
 
-    def _initialize_email_service(self) -> None:
-        """Initialize email service if configuration is available."""
+    def _initialize_email_service(self, prev_config: Optional[EmailConfig] = None) -> None:
+        """Initialize email service if configuration is available.
+
+        Pass the configuration from before a change as prev_config; if only the
+        enabled flag differs, the existing service (and its pooled SMTP
+        connections) is kept and just switched on or off.
+        """
         try:
-            if email_config_manager.is_configured():
-                config = email_config_manager.get_config()
+            config = email_config_manager.get_config()
+            if (prev_config is not None and config is not None and self.email_service
+                    and replace(prev_config, enabled=config.enabled) == config):
+                self.email_enabled = email_config_manager.is_configured()
+                logger.info(
+                    f"Email notifications {'enabled' if self.email_enabled else 'disabled'}")
+                return
+
+            # Settings changed, so sessions logged in with the old ones are useless
+            if self.email_service:
+                self.email_service.close()
+                self.email_service = None
+
+            self.email_enabled = email_config_manager.is_configured()
+            if self.email_enabled:
                 self.email_service = EmailService(
                     smtp_server=config.smtp_server,
                     smtp_port=config.smtp_port,
@@ -57,10 +147,11 @@ class AlertManager:
         except Exception as e:
             logger.error(f"Failed to initialize email service: {e}")
             self.email_service = None
+            self.email_enabled = False
 
     async def send_alert_notification(self, alert: PriceAlert, trigger_message: str, current_price: float) -> bool:
         """Send email notification for triggered alert."""
-        if not self.email_service:
+        if not (self.email_service and self.email_enabled):
             logger.info(
                 f"Email not configured - alert triggered: {trigger_message}")
             return False
@@ -98,10 +189,9 @@ class AlertManager:
         """Load alerts from JSON file."""
         try:
             if self.alerts_file.exists():
-                with open(self.alerts_file, 'r') as f:
-                    data = json.load(f)
-                    self.alerts = [PriceAlert(**alert)
-                                   for alert in data.get('alerts', [])]
+                data = _json_loads(self.alerts_file.read_bytes())
+                self.alerts = [PriceAlert(**alert)
+                               for alert in data.get('alerts', [])]
                 logger.info(
                     f"Loaded {len(self.alerts)} alerts from {self.alerts_file}")
             else:
@@ -112,6 +202,13 @@ class AlertManager:
             logger.error(f"Error loading alerts: {e}")
             self.alerts = []
 
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the alert ID index after self.alerts changes."""
+        self._by_id = {alert.id: alert for alert in self.alerts}
+        self._sorted_ids = sorted(self._by_id)
+
     def save_alerts(self) -> None:
         """Save alerts to JSON file."""
         try:
@@ -119,8 +216,12 @@ class AlertManager:
                 'alerts': [alert.dict() for alert in self.alerts],
                 'last_updated': datetime.now().isoformat()
             }
-            with open(self.alerts_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            if ORJSON_AVAILABLE:
+                self.alerts_file.write_bytes(orjson.dumps(
+                    data, option=orjson.OPT_INDENT_2, default=str))
+            else:
+                with open(self.alerts_file, 'w') as f:
+                    json.dump(data, f, indent=2, default=str)
             logger.info(
                 f"Saved {len(self.alerts)} alerts to {self.alerts_file}")
         except Exception as e:
@@ -130,7 +231,7 @@ class AlertManager:
                            base_price: Optional[float] = None, message: Optional[str] = None) -> PriceAlert:
         """Create a new price alert."""
         # Validate and normalize symbol
-        symbol = symbol.upper().strip()
+        symbol = normalize_symbol(symbol)
 
         # Try to get current price to validate symbol exists
         validated_symbol = symbol
@@ -186,6 +287,7 @@ class AlertManager:
         )
 
         self.alerts.append(alert)
+        self._reindex()
         self.save_alerts()
 
         logger.info(
@@ -197,8 +299,10 @@ class AlertManager:
         filtered_alerts = self.alerts
 
         if symbol:
+            # Alert symbols are normalized when the alert is created or loaded
+            symbol = normalize_symbol(symbol)
             filtered_alerts = [
-                alert for alert in filtered_alerts if alert.symbol.upper() == symbol.upper()]
+                alert for alert in filtered_alerts if alert.symbol == symbol]
 
         if status:
             filtered_alerts = [
@@ -208,40 +312,44 @@ class AlertManager:
 
     def get_alert_by_id(self, alert_id: str) -> Optional[PriceAlert]:
         """Get alert by ID."""
-        for alert in self.alerts:
-            if alert.id == alert_id:
-                return alert
-        return None
+        return self._by_id.get(alert_id)
+
+    def _ids_with_prefix(self, id_prefix: str) -> List[str]:
+        """Get the IDs of all alerts starting with id_prefix, via the sorted ID list."""
+        ids = self._sorted_ids
+        matches = []
+        for i in range(bisect_left(ids, id_prefix), len(ids)):
+            if not ids[i].startswith(id_prefix):
+                break
+            matches.append(ids[i])
+        return matches
+
+    def get_alert(self, id_prefix: str) -> Optional[PriceAlert]:
+        """Get alert by full ID or by a partial ID that matches exactly one alert."""
+        alert = self._by_id.get(id_prefix)
+        if alert:
+            return alert
+
+        matches = self._ids_with_prefix(id_prefix)
+        return self._by_id[matches[0]] if len(matches) == 1 else None
 
     def remove_alert(self, alert_id: str) -> bool:
         """Remove alert by ID (supports both full and partial IDs)."""
-        # First try exact match
-        for i, alert in enumerate(self.alerts):
-            if alert.id == alert_id:
-                removed_alert = self.alerts.pop(i)
-                self.save_alerts()
-                logger.info(
-                    f"Removed alert {alert_id} for {removed_alert.symbol}")
-                return True
-
-        # If no exact match, try partial ID matching
-        matching_alerts = [
-            (i, alert) for i, alert in enumerate(self.alerts)
-            if alert.id.startswith(alert_id)
-        ]
+        alert = self.get_alert(alert_id)
 
-        if len(matching_alerts) == 1:
-            # Exactly one match found
-            i, alert = matching_alerts[0]
-            removed_alert = self.alerts.pop(i)
+        if alert:
+            self.alerts.remove(alert)
+            self._reindex()
             self.save_alerts()
             logger.info(
-                f"Removed alert {alert.id} (matched partial ID {alert_id}) for {removed_alert.symbol}")
+                f"Removed alert {alert.id} (matched ID {alert_id}) for {alert.symbol}")
             return True
-        elif len(matching_alerts) > 1:
+
+        matches = self._ids_with_prefix(alert_id)
+        if len(matches) > 1:
             # Multiple matches - this shouldn't happen in normal usage but let's be safe
             logger.warning(
-                f"Multiple alerts match partial ID {alert_id}: {[alert.id for _, alert in matching_alerts]}")
+                f"Multiple alerts match partial ID {alert_id}: {matches}")
             return False
 
         # No matches found
@@ -258,11 +366,14 @@ class AlertManager:
             return True
         return False
 
-    async def check_single_alert(self, alert: PriceAlert) -> Optional[str]:
+    async def check_single_alert(self, alert: PriceAlert, price_data=None) -> Optional[str]:
         """Check a single alert and return trigger message if triggered."""
         try:
-            # Get current stock price
-            price_data = await self.groww_client.get_stock_price(alert.symbol)
+            # Get current stock price unless the caller already fetched it
+            if price_data is None:
+                price_data = await self.groww_client.get_stock_price(alert.symbol)
+            elif isinstance(price_data, Exception):
+                raise price_data
             current_price = price_data.ltp
             current_volume = price_data.volume
 
@@ -309,8 +420,13 @@ class AlertManager:
                 f"Skipping alert check - market closed. Next session: {market_status['next_session']}")
             return triggered_messages
 
+        # Fetch each distinct symbol's price once
+        prices = await self.groww_client.get_quotes_bulk(
+            [alert.symbol for alert in active_alerts])
+
         for alert in active_alerts:
-            trigger_message = await self.check_single_alert(alert)
+            trigger_message = await self.check_single_alert(
+                alert, prices.get(alert.symbol))
             if trigger_message:
                 triggered_messages.append(trigger_message)
 
@@ -352,12 +468,11 @@ class AlertManager:
 
         try:
             while True:
-                market_status = get_market_status()
+                # One clock read decides both whether to check and how long to sleep
+                should_monitor, wait_time = next_action()
 
-                # Check if we should monitor based on market hours
-                if should_monitor_alerts():
-                    logger.debug(
-                        f"Market open - checking alerts ({market_status['status']})")
+                if should_monitor:
+                    logger.debug("Market open - checking alerts")
                     triggered_messages = await self.check_all_alerts()
 
                     if triggered_messages:
@@ -366,12 +481,9 @@ class AlertManager:
                         for message in triggered_messages:
                             # TODO: Send email notification here in next step
                             logger.info(f"ALERT TRIGGERED: {message}")
-
-                    # Use market-appropriate interval
-                    wait_time = get_monitoring_interval()
                 else:
-                    # Market is closed - wait longer
-                    wait_time = 3600  # 1 hour
+                    # Market is closed - skip alert evaluation entirely
+                    market_status = get_market_status()
                     logger.info(
                         f"Market closed ({market_status['status']}) - sleeping for {wait_time}s until {market_status['next_session']}")
 
@@ -424,8 +536,7 @@ class AlertManager:
         """
         # Try to parse as JSON first (structured data from LLM)
         try:
-            import json
-            parsed_data = json.loads(command)
+            parsed_data = _json_loads(command)
 
             # Extract structured data
             stock_name = parsed_data.get('stock_name', '').strip()
@@ -505,48 +616,40 @@ class AlertManager:
         Basic fallback extraction for when structured data isn't provided.
         This is much simpler than the old hardcoded approach.
         """
-        import re
-
-        # Simple patterns for fallback (much more flexible than before)
-        stock_pattern = r'\b([A-Z]{2,}|[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
-        percentage_pattern = r'(\d+(?:\.\d+)?)\s*%'
-        price_pattern = r'(?:₹|Rs\.?\s*)?(\d+(?:\.\d+)?)'
-
         # Extract potential stock names (any capitalized words)
-        stock_matches = re.findall(stock_pattern, command)
+        stock_matches = _STOCK_RE.findall(command)
         # Filter out common words
-        common_words = {'SET', 'ALERT', 'FOR', 'IF', 'IT', 'GOES', 'UP',
-                        'DOWN', 'BY', 'WHEN', 'ABOVE', 'BELOW', 'ME', 'THE', 'A', 'AND', 'OR'}
         potential_stocks = [
-            s for s in stock_matches if s.upper() not in common_words and len(s) >= 2]
+            s for s in stock_matches if s.upper() not in _COMMON_WORDS and len(s) >= 2]
 
         stock_name = potential_stocks[0] if potential_stocks else ""
 
         # Determine alert type and threshold
         alert_type_hint = ""
         threshold_value = 0.0
+        command_lower = command.lower()
 
-        if "up" in command.lower() and "%" in command:
+        if "up" in command_lower and "%" in command:
             alert_type_hint = "percentage_increase"
-            percentage_match = re.search(percentage_pattern, command)
+            percentage_match = _PERCENTAGE_RE.search(command)
             if percentage_match:
                 threshold_value = float(percentage_match.group(1))
 
-        elif "down" in command.lower() and "%" in command:
+        elif "down" in command_lower and "%" in command:
             alert_type_hint = "percentage_decrease"
-            percentage_match = re.search(percentage_pattern, command)
+            percentage_match = _PERCENTAGE_RE.search(command)
             if percentage_match:
                 threshold_value = float(percentage_match.group(1))
 
-        elif "above" in command.lower():
+        elif "above" in command_lower:
             alert_type_hint = "price_above"
-            price_match = re.search(price_pattern, command)
+            price_match = _PRICE_RE.search(command)
             if price_match:
                 threshold_value = float(price_match.group(1))
 
-        elif "below" in command.lower():
+        elif "below" in command_lower:
             alert_type_hint = "price_below"
-            price_match = re.search(price_pattern, command)
+            price_match = _PRICE_RE.search(command)
             if price_match:
                 threshold_value = float(price_match.group(1))
 
@@ -557,7 +660,7 @@ class AlertManager:
         Resolve stock name to symbol and validate it exists.
         Uses the existing dynamic search logic but simplified.
         """
-        stock_name = stock_name.upper().strip()
+        stock_name = normalize_symbol(stock_name)
 
         # Try direct lookup first
         try:
@@ -592,53 +695,4 @@ class AlertManager:
 
     def _map_alert_type(self, alert_type_hint: str) -> Optional[AlertType]:
         """Map natural language alert type hints to AlertType enum."""
-        alert_type_hint = alert_type_hint.lower().strip()
-
-        # Flexible mapping for various ways to express alert types
-        type_mappings = {
-            # Percentage increase
-            'percentage_increase': AlertType.PERCENTAGE_INCREASE,
-            'percent_increase': AlertType.PERCENTAGE_INCREASE,
-            'percentage_up': AlertType.PERCENTAGE_INCREASE,
-            'percent_up': AlertType.PERCENTAGE_INCREASE,
-            'up_by_percent': AlertType.PERCENTAGE_INCREASE,
-            'increase_by_percent': AlertType.PERCENTAGE_INCREASE,
-            'rise_by_percent': AlertType.PERCENTAGE_INCREASE,
-
-            # Percentage decrease
-            'percentage_decrease': AlertType.PERCENTAGE_DECREASE,
-            'percent_decrease': AlertType.PERCENTAGE_DECREASE,
-            'percentage_down': AlertType.PERCENTAGE_DECREASE,
-            'percent_down': AlertType.PERCENTAGE_DECREASE,
-            'down_by_percent': AlertType.PERCENTAGE_DECREASE,
-            'decrease_by_percent': AlertType.PERCENTAGE_DECREASE,
-            'fall_by_percent': AlertType.PERCENTAGE_DECREASE,
-            'drop_by_percent': AlertType.PERCENTAGE_DECREASE,
-
-            # Price above
-            'price_above': AlertType.PRICE_ABOVE,
-            'above_price': AlertType.PRICE_ABOVE,
-            'price_over': AlertType.PRICE_ABOVE,
-            'over_price': AlertType.PRICE_ABOVE,
-            'price_exceeds': AlertType.PRICE_ABOVE,
-            'exceeds_price': AlertType.PRICE_ABOVE,
-            'price_crosses_up': AlertType.PRICE_ABOVE,
-            'goes_above': AlertType.PRICE_ABOVE,
-
-            # Price below
-            'price_below': AlertType.PRICE_BELOW,
-            'below_price': AlertType.PRICE_BELOW,
-            'price_under': AlertType.PRICE_BELOW,
-            'under_price': AlertType.PRICE_BELOW,
-            'price_falls_below': AlertType.PRICE_BELOW,
-            'falls_below': AlertType.PRICE_BELOW,
-            'price_crosses_down': AlertType.PRICE_BELOW,
-            'goes_below': AlertType.PRICE_BELOW,
-
-            # Volume alerts
-            'volume_above': AlertType.VOLUME_ABOVE,
-            'volume_over': AlertType.VOLUME_ABOVE,
-            'high_volume': AlertType.VOLUME_ABOVE,
-        }
-
-        return type_mappings.get(alert_type_hint)
+        return _ALERT_TYPE_MAPPINGS.get(alert_type_hint.lower().strip())
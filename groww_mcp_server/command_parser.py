@@ -3,6 +3,7 @@ Natural language command parser for trading commands.
 """
 
 import re
+from functools import lru_cache
 from typing import Optional, List, Union
 from .models import TradeCommand, OrderType, OrderSide
 
@@ -56,6 +57,8 @@ class CommandParser:
 
     def __init__(self):
         self.compiled_patterns = self._compile_patterns()
+        # Users tend to repeat the same commands, so memoize parsed results
+        self._parse_cached = lru_cache(maxsize=1024)(self._parse_command_uncached)
 
     def _compile_patterns(self) -> dict:
         """Compile regex patterns for better performance."""
@@ -171,8 +174,10 @@ class CommandParser:
 
     def parse_command(self, command: str) -> Optional[TradeCommand]:
         """Parse natural language trading command."""
-        command = command.strip()
+        return self._parse_cached(command.strip())
 
+    def _parse_command_uncached(self, command: str) -> Optional[TradeCommand]:
+        """Parse a stripped trading command without consulting the cache."""
         # Determine action (buy/sell)
         action = None
         if self._extract_with_patterns(command, self.compiled_patterns['buy']):
@@ -23,6 +23,10 @@ class GrowwConfig:
             "GROWW_BASE_URL", "https://api.groww.in")
         self.timeout: int = int(os.getenv("API_TIMEOUT", "30"))
 
+        # Caching - how long a fetched stock price may be reused (seconds)
+        self.price_cache_ttl: float = float(
+            os.getenv("PRICE_CACHE_TTL", "2"))
+
         # Trading configuration
         self.max_order_value: float = float(
             os.getenv("MAX_ORDER_VALUE", "100000"))
@@ -70,6 +74,9 @@ class GrowwConfig:
         if self.max_order_value <= 0:
             errors.append("MAX_ORDER_VALUE must be positive")
 
+        if self.price_cache_ttl < 0:
+            errors.append("PRICE_CACHE_TTL must not be negative")
+
         return errors
 
 
@@ -2,12 +2,14 @@
 Email configuration management for Groww MCP Server.
 """
 
+import asyncio
 import json
 import os
 import logging
-from typing import Dict, Optional, Any, List, Union
+from types import MappingProxyType
+from typing import Dict, Optional, Any, List, Mapping, Union
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +25,20 @@ class EmailConfig:
     to_emails: List[str]
     use_tls: bool = True
     enabled: bool = True
+    # Recipients joined for display, filled in by normalize_recipients()
+    to_emails_display: str = field(default='', init=False, repr=False, compare=False)
+
+    def normalize_recipients(self) -> None:
+        """Strip, lowercase and dedupe to_emails, and cache their display string."""
+        if isinstance(self.to_emails, list):
+            self.to_emails = list(dict.fromkeys(
+                email.strip().lower() for email in self.to_emails))
+            self.to_emails_display = ', '.join(self.to_emails)
 
     def validate(self) -> bool:
         """Validate email configuration."""
-        if not all([self.smtp_server, self.username, self.password,
-                   self.from_email, self.to_emails]):
+        if not (self.smtp_server and self.username and self.password
+                and self.from_email and self.to_emails):
             return False
 
         if not (1 <= self.smtp_port <= 65535):
@@ -105,8 +116,18 @@ class EmailConfigManager:
             self.config_file = possible_paths[0]
 
         self._config: Optional[EmailConfig] = None
+        self._config_valid = False
+        # Bumped on every config change; derived state is cached against it
+        self._config_version = 0
+        self._status_cache: tuple = (-1, None)
         self._load_config()
 
+    def _set_config(self, config: Optional[EmailConfig]) -> None:
+        """Replace the current configuration and memoize whether it is valid."""
+        self._config = config
+        self._config_valid = config is not None and config.validate()
+        self._config_version += 1
+
     def _load_config(self) -> None:
         """Load email configuration from file or environment."""
         config_data = {}
@@ -127,10 +148,12 @@ class EmailConfigManager:
             logger.info("Email config loaded from environment variables")
 
         if config_data:
-            self._config = EmailConfig.from_dict(config_data)
-            if not self._config.validate():
+            config = EmailConfig.from_dict(config_data)
+            config.normalize_recipients()
+            self._set_config(config)
+            if not self._config_valid:
                 logger.warning("Invalid email configuration")
-                self._config = None
+                self._set_config(None)
         else:
             logger.info("No email configuration found")
 
@@ -161,28 +184,54 @@ class EmailConfigManager:
 
         return config
 
+    def _write_config_file(self, config: EmailConfig) -> None:
+        """Normalize a configuration and write it to the config file."""
+        config.normalize_recipients()
+        with open(self.config_file, 'w') as f:
+            json.dump(config.to_dict(), f, indent=2)
+
     def save_config(self, config: EmailConfig) -> bool:
         """Save email configuration to file."""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config.to_dict(), f, indent=2)
-            self._config = config
+            self._write_config_file(config)
+            self._set_config(config)
             logger.info("Email configuration saved successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to save email config: {e}")
             return False
 
+    async def save_config_async(self, config: EmailConfig) -> bool:
+        """Save email configuration, writing the file in a worker thread.
+
+        Only the file write leaves the event loop; the in-memory state is
+        swapped on the caller's loop, so readers never see it half-updated.
+        Callers must serialize concurrent saves themselves.
+        """
+        try:
+            await asyncio.to_thread(self._write_config_file, config)
+        except Exception as e:
+            logger.error(f"Failed to save email config: {e}")
+            return False
+
+        self._set_config(config)
+        logger.info("Email configuration saved successfully")
+        return True
+
     def get_config(self) -> Optional[EmailConfig]:
         """Get current email configuration."""
         return self._config
 
     def is_configured(self) -> bool:
         """Check if email is properly configured."""
-        return self._config is not None and self._config.validate() and self._config.enabled
+        return self._config_valid and self._config.enabled
 
     def update_config(self, **kwargs) -> bool:
         """Update specific configuration values."""
+        return self.save_config(self._updated_config(**kwargs))
+
+    def _updated_config(self, **kwargs) -> EmailConfig:
+        """Build a new configuration from the current one with kwargs applied."""
         if not self._config:
             # Create new config with provided values
             config_data = {
@@ -202,7 +251,7 @@ class EmailConfigManager:
             config_dict.update(kwargs)
             new_config = EmailConfig.from_dict(config_dict)
 
-        return self.save_config(new_config)
+        return new_config
 
     def disable_email(self) -> bool:
         """Disable email notifications."""
@@ -212,33 +261,53 @@ class EmailConfigManager:
 
     def enable_email(self) -> bool:
         """Enable email notifications if properly configured."""
-        if self._config and self._config.validate():
+        if self._config_valid:
             return self.update_config(enabled=True)
         return False
 
-    def get_status(self) -> Dict[str, Any]:
-        """Get email configuration status."""
+    async def set_enabled_async(self, enabled: bool) -> bool:
+        """enable_email()/disable_email() with the file written off the event loop."""
+        if enabled and not self._config_valid:
+            return False
+        if not enabled and not self._config:
+            return True
+        return await self.save_config_async(self._updated_config(enabled=enabled))
+
+    def get_status(self) -> Mapping[str, Any]:
+        """Get email configuration status (a read-only mapping shared between calls)."""
+        version, status = self._status_cache
+        if version == self._config_version:
+            return status
+
+        status = self._build_status()
+        self._status_cache = (self._config_version, status)
+        return status
+
+    def _build_status(self) -> Mapping[str, Any]:
+        """Build the read-only status mapping for the current configuration."""
         if not self._config:
-            return {
+            return MappingProxyType({
                 'configured': False,
                 'enabled': False,
                 'valid': False,
                 'smtp_server': None,
                 'smtp_port': None,
                 'from_email': None,
-                'to_emails': None
-            }
+                'to_emails': None,
+                'to_emails_display': None
+            })
 
-        return {
+        return MappingProxyType({
             'configured': True,
             'enabled': self._config.enabled,
-            'valid': self._config.validate(),
+            'valid': self._config_valid,
             'smtp_server': self._config.smtp_server,
             'smtp_port': self._config.smtp_port,
             'from_email': self._config.from_email,
-            'to_emails': self._config.to_emails,
+            'to_emails': tuple(self._config.to_emails),
+            'to_emails_display': self._config.to_emails_display,
             'use_tls': self._config.use_tls
-        }
+        })
 
     @staticmethod
     def get_gmail_config(email: str, app_password: str, to_email: str) -> EmailConfig:
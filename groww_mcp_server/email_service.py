@@ -2,19 +2,69 @@
 Email service for sending alert notifications.
 """
 
+import hashlib
 import smtplib
+import socket
 import logging
+import queue
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import asyncio
 from pathlib import Path
 
+from .email_templates import create_alert_email_template
+
 logger = logging.getLogger(__name__)
 
+# Idle SMTP connections keyed on (server, port, username, password digest,
+# use_tls), so the TLS handshake and login are paid once and reused by later
+# sends, and a changed password never reuses a session from the old one
+_smtp_pool: Dict[Tuple[str, int, str, str, bool], queue.SimpleQueue] = {}
+
+# Failures that mean the server could not be reached or refused our login
+SMTP_CONNECTION_ERRORS = (
+    smtplib.SMTPConnectError,
+    smtplib.SMTPAuthenticationError,
+    smtplib.SMTPServerDisconnected,
+    socket.gaierror,
+    ConnectionError,
+    TimeoutError,
+)
+
+# Servers drop idle sessions after a few minutes; don't reuse older ones
+SMTP_IDLE_TIMEOUT = 120
+
+
+def _close_quietly(server: smtplib.SMTP) -> None:
+    """Close an SMTP connection, ignoring errors from an already dead session."""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+def _drain_pool(pool: queue.SimpleQueue) -> None:
+    """Close every idle connection held in a pool."""
+    while True:
+        try:
+            server, _ = pool.get_nowait()
+        except queue.Empty:
+            return
+        _close_quietly(server)
+
+
+def close_pooled_connections() -> None:
+    """Close all idle pooled SMTP connections, e.g. on shutdown."""
+    for key in list(_smtp_pool):
+        pool = _smtp_pool.pop(key, None)
+        if pool is not None:
+            _drain_pool(pool)
+
 
 class EmailService:
     """Service for sending email notifications."""
@@ -48,6 +98,9 @@ class EmailService:
             to_emails, list) else [to_emails]
         self.use_tls = use_tls
 
+        password_digest = hashlib.sha256(password.encode('utf-8')).hexdigest()
+        self._pool_key = (smtp_server, smtp_port, username, password_digest, use_tls)
+
         # Rate limiting
         self.last_email_time = {}
         self.rate_limit_seconds = 60  # Minimum 1 minute between emails for same alert type
@@ -56,7 +109,9 @@ class EmailService:
                          subject: str,
                          body_text: str,
                          body_html: Optional[str] = None,
-                         alert_type: str = "general") -> bool:
+                         alert_type: str = "general",
+                         raise_connection_errors: bool = False,
+                         fresh_connection: bool = False) -> bool:
         """
         Send an email notification to all recipients.
 
@@ -65,6 +120,8 @@ class EmailService:
             body_text: Plain text body
             body_html: HTML body (optional)
             alert_type: Type of alert for rate limiting
+            raise_connection_errors: Re-raise SMTP_CONNECTION_ERRORS instead of returning False
+            fresh_connection: Dial and log in anew instead of reusing a pooled connection
 
         Returns:
             True if email sent successfully to all recipients, False otherwise
@@ -92,7 +149,7 @@ class EmailService:
                 msg.attach(html_part)
 
             # Send email to all recipients
-            await self._send_message(msg)
+            await self._send_message(msg, fresh_connection)
 
             # Update rate limiting
             self.last_email_time[alert_type] = datetime.now()
@@ -102,6 +159,8 @@ class EmailService:
             return True
 
         except Exception as e:
+            if raise_connection_errors and isinstance(e, SMTP_CONNECTION_ERRORS):
+                raise
             logger.error(f"Failed to send email to recipients: {e}")
             return False
 
@@ -125,9 +184,6 @@ class EmailService:
             True if email sent successfully
         """
         try:
-            # Import here to avoid circular imports
-            from .email_templates import create_alert_email_template
-
             # Generate email content
             email_content = create_alert_email_template(
                 alert_message=alert_message,
@@ -149,7 +205,7 @@ class EmailService:
             logger.error(f"Failed to send alert email: {e}")
             return False
 
-    async def send_test_email(self) -> bool:
+    async def send_test_email(self, raise_connection_errors: bool = False) -> bool:
         """Send a test email to verify configuration."""
         try:
             subject = "🧪 Groww MCP Alert System - Test Email"
@@ -218,39 +274,75 @@ Happy trading! 📈
                 subject=subject,
                 body_text=text_body,
                 body_html=html_body,
-                alert_type="test"
+                alert_type="test",
+                raise_connection_errors=raise_connection_errors,
+                # A configuration test must really run STARTTLS and LOGIN
+                fresh_connection=True
             )
 
         except Exception as e:
+            if raise_connection_errors and isinstance(e, SMTP_CONNECTION_ERRORS):
+                raise
             logger.error(f"Failed to send test email: {e}")
             return False
 
-    async def _send_message(self, msg: MIMEMultipart) -> None:
+    async def _send_message(self, msg: MIMEMultipart, fresh_connection: bool = False) -> None:
         """Send the email message via SMTP."""
         # Run in thread pool to avoid blocking
         loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._send_message_sync, msg)
+        await loop.run_in_executor(None, self._send_message_sync, msg, fresh_connection)
 
-    def _send_message_sync(self, msg: MIMEMultipart) -> None:
-        """Synchronous email sending."""
-        server = None
+    def _open_connection(self) -> smtplib.SMTP:
+        """Dial, secure and log in to the SMTP server."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
         try:
-            # Create SMTP server
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-
             if self.use_tls:
                 server.starttls()
-
-            # Login
             server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    def _acquire_connection(self) -> smtplib.SMTP:
+        """Take a live pooled connection, or open a new one if none is available."""
+        pool = _smtp_pool.setdefault(self._pool_key, queue.SimpleQueue())
+        while True:
+            try:
+                server, last_used = pool.get_nowait()
+            except queue.Empty:
+                return self._open_connection()
+
+            if time.monotonic() - last_used < SMTP_IDLE_TIMEOUT:
+                try:
+                    if server.noop()[0] == 250:
+                        return server
+                except (smtplib.SMTPException, OSError):
+                    pass
+            _close_quietly(server)
+
+    def close(self) -> None:
+        """Close the idle pooled connections opened with this service's settings."""
+        pool = _smtp_pool.pop(self._pool_key, None)
+        if pool is not None:
+            _drain_pool(pool)
+
+    def _release_connection(self, server: smtplib.SMTP) -> None:
+        """Return a healthy connection to the pool for the next send."""
+        _smtp_pool.setdefault(self._pool_key, queue.SimpleQueue()).put(
+            (server, time.monotonic()))
+
+    def _send_message_sync(self, msg: MIMEMultipart, fresh_connection: bool = False) -> None:
+        """Synchronous email sending."""
+        server = self._open_connection() if fresh_connection else self._acquire_connection()
+        try:
+            # One transaction for all recipients (a RCPT TO per address)
+            server.send_message(msg, from_addr=self.from_email, to_addrs=self.to_emails)
+        except BaseException:
+            _close_quietly(server)
+            raise
 
-            # Send message
-            text = msg.as_string()
-            server.sendmail(self.from_email, self.to_emails, text)
-
-        finally:
-            if server:
-                server.quit()
+        self._release_connection(server)
 
     def _is_rate_limited(self, alert_type: str) -> bool:
         """Check if this alert type is rate limited."""
@@ -263,11 +355,8 @@ Happy trading! 📈
     def test_connection(self) -> bool:
         """Test SMTP connection without sending email."""
         try:
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            if self.use_tls:
-                server.starttls()
-            server.login(self.username, self.password)
-            server.quit()
+            # Keep the verified connection so the next send can reuse it
+            self._release_connection(self._acquire_connection())
             return True
         except Exception as e:
             logger.error(f"SMTP connection test failed: {e}")
@@ -6,6 +6,12 @@ from typing import Dict, Optional
 from datetime import datetime
 from .market_utils import get_ist_now, get_market_status
 
+# is_positive -> (accent color, header gradient end, price box background, icon)
+_ALERT_STYLES = {
+    True: ("#10b981", "#059669", "#ecfdf5", "📈"),  # Green
+    False: ("#ef4444", "#dc2626", "#fef2f2", "📉"),  # Red
+}
+
 
 def create_alert_email_template(alert_message: str,
                                 symbol: str,
@@ -30,15 +36,14 @@ def create_alert_email_template(alert_message: str,
     timestamp = get_ist_now().strftime('%Y-%m-%d %H:%M:%S IST')
 
     # Determine alert type and styling
-    is_positive = True
-    if "down" in alert_message.lower() or "below" in alert_message.lower():
-        is_positive = False
+    message_lower = alert_message.lower()
+    is_positive = not ("down" in message_lower or "below" in message_lower)
+    alert_color, header_end_color, price_box_color, alert_icon = _ALERT_STYLES[is_positive]
 
     # Create subject line
     subject = f"🚨 {symbol} Alert Triggered"
     if percentage_change:
-        direction = "📈" if is_positive else "📉"
-        subject = f"{direction} {symbol} Alert: {percentage_change:+.2f}%"
+        subject = f"{alert_icon} {symbol} Alert: {percentage_change:+.2f}%"
 
     # Create text version
     text_content = f"""
@@ -69,13 +74,10 @@ Powered by Claude & Cursor
     """.strip()
 
     # Create HTML version
-    alert_color = "#10b981" if is_positive else "#ef4444"  # Green or Red
-    alert_icon = "📈" if is_positive else "📉"
-
     price_change_section = ""
     if base_price and percentage_change:
         price_change_section = f"""
-        <div style="background: {'#ecfdf5' if is_positive else '#fef2f2'}; border-left: 4px solid {alert_color}; padding: 15px; margin: 20px 0; border-radius: 0 8px 8px 0;">
+        <div style="background: {price_box_color}; border-left: 4px solid {alert_color}; padding: 15px; margin: 20px 0; border-radius: 0 8px 8px 0;">
             <h3 style="color: #1f2937; margin: 0 0 10px 0; display: flex; align-items: center;">
                 <span style="font-size: 24px; margin-right: 10px;">{alert_icon}</span>
                 Price Movement
@@ -107,7 +109,7 @@ Powered by Claude & Cursor
         <div style="max-width: 600px; margin: 0 auto; background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);">
             
             <!-- Header -->
-            <div style="background: linear-gradient(135deg, {alert_color} 0%, {'#059669' if is_positive else '#dc2626'} 100%); color: white; padding: 30px 25px; text-align: center;">
+            <div style="background: linear-gradient(135deg, {alert_color} 0%, {header_end_color} 100%); color: white; padding: 30px 25px; text-align: center;">
                 <div style="font-size: 48px; margin-bottom: 10px;">{alert_icon}</div>
                 <h1 style="margin: 0; font-size: 28px; font-weight: 700;">Alert Triggered!</h1>
                 <p style="margin: 10px 0 0 0; font-size: 18px; opacity: 0.9;">{symbol} Stock Alert</p>
@@ -4,14 +4,13 @@ Updated to use the official Groww API according to the documentation.
 """
 
 import asyncio
-import json
 import logging
 import sys
 import io
 import contextlib
 import time
 import hashlib
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 
@@ -47,6 +46,18 @@ class GrowwAPIError(Exception):
     pass
 
 
+async def gather_bounded(coros, n: int = 10, return_exceptions: bool = False) -> list:
+    """Run coroutines concurrently like asyncio.gather, but at most n at a time."""
+    semaphore = asyncio.Semaphore(n)
+
+    async def _run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(coro) for coro in coros),
+                                return_exceptions=return_exceptions)
+
+
 class GrowwClient:
     """Groww API client for trading operations."""
 
@@ -57,6 +68,11 @@ class GrowwClient:
         # order_hash -> timestamp
         self._order_dedup_cache: Dict[str, float] = {}
         self._cache_timeout = 60  # 60 seconds to prevent duplicates
+        # symbol -> (fetched_at, price); expired entries are dropped on each write
+        self._price_cache: Dict[str, Tuple[float, StockPrice]] = {}
+        self._price_cache_ttl = config.price_cache_ttl
+        # symbol -> in-flight fetch, so concurrent cache misses share one upstream request
+        self._price_pending: Dict[str, asyncio.Task] = {}
 
         if GROWW_API_AVAILABLE and self.api_auth_token:
             # Use official Groww API - suppress stdout to avoid MCP protocol interference
@@ -85,18 +101,65 @@ class GrowwClient:
         pass
 
     async def get_stock_price(self, symbol: str) -> StockPrice:
+        """Get current stock price, reusing a recent result if one is cached."""
+        cached = self._price_cache.get(symbol)
+        if cached and time.monotonic() - cached[0] <= self._price_cache_ttl:
+            return cached[1]
+
+        # Single-flight: the first caller starts the fetch, concurrent callers
+        # for the same symbol await the same task
+        task = self._price_pending.get(symbol)
+        if task is None:
+            task = self._price_pending[symbol] = asyncio.ensure_future(
+                self._fetch_and_cache_price(symbol))
+        # Shield the shared fetch so one cancelled caller doesn't cancel the rest
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache_price(self, symbol: str) -> StockPrice:
+        """Fetch a stock price and store it in the price cache."""
+        try:
+            stock_price = await self._fetch_stock_price(symbol)
+            now = time.monotonic()
+            # Drop expired entries so symbols looked up once don't linger
+            self._price_cache = {
+                k: v for k, v in self._price_cache.items()
+                if now - v[0] <= self._price_cache_ttl
+            }
+            self._price_cache[symbol] = (now, stock_price)
+            return stock_price
+        finally:
+            del self._price_pending[symbol]
+
+    async def get_quotes_bulk(self, symbols: List[str]) -> Dict[str, Any]:
+        """Get prices for many symbols at once, mapping each to a StockPrice or the error raised."""
+        # The quote endpoint (the only one with volume and day change) takes a
+        # single symbol, so fetch the distinct symbols concurrently, bounded
+        # to stay within Groww's rate limits
+        symbols = list(dict.fromkeys(symbols))
+        results = await gather_bounded(
+            (self.get_stock_price(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+        return dict(zip(symbols, results))
+
+    async def _fetch_stock_price(self, symbol: str) -> StockPrice:
         """Get current stock price information using Groww API."""
         try:
+            # The SDK is blocking, so run its calls in a worker thread to let
+            # concurrent price lookups overlap
             # Try to get quote data first
-            quote_data = self.groww_api.get_quote(
+            quote_data = await asyncio.to_thread(
+                self.groww_api.get_quote,
                 exchange="NSE",
                 segment="CASH",
                 trading_symbol=symbol
             )
 
+            # Values are coerced to their field types here, so build the
+            # StockPrice with model_construct() and skip pydantic validation
             if quote_data and 'last_price' in quote_data:
                 ohlc = quote_data.get('ohlc', {})
-                return StockPrice(
+                return StockPrice.model_construct(
                     symbol=symbol,
                     ltp=float(quote_data.get('last_price', 0)),
                     open=float(ohlc.get('open', 0)),
@@ -110,7 +173,8 @@ class GrowwClient:
                 )
 
             # Fallback to LTP if quote not available
-            ltp_data = self.groww_api.get_ltp(
+            ltp_data = await asyncio.to_thread(
+                self.groww_api.get_ltp,
                 segment="CASH",
                 exchange_trading_symbols=(f"NSE_{symbol}",)
             )
@@ -120,7 +184,8 @@ class GrowwClient:
 
                 # Try to get OHLC data as well
                 try:
-                    ohlc_data = self.groww_api.get_ohlc(
+                    ohlc_data = await asyncio.to_thread(
+                        self.groww_api.get_ohlc,
                         segment="CASH",
                         exchange_trading_symbols=(f"NSE_{symbol}",)
                     )
@@ -129,7 +194,7 @@ class GrowwClient:
                 except:
                     ohlc = {}
 
-                return StockPrice(
+                return StockPrice.model_construct(
                     symbol=symbol,
                     ltp=ltp_value,
                     open=float(ohlc.get('open', ltp_value)),
@@ -182,10 +247,10 @@ class GrowwClient:
                 if pd.isna(industry):
                     industry = None
 
-                results.append(StockInfo(
-                    symbol=instrument['trading_symbol'],
+                results.append(StockInfo.model_construct(
+                    symbol=str(instrument['trading_symbol']),
                     name=str(name),  # Ensure it's a string
-                    exchange=instrument['exchange'],
+                    exchange=str(instrument['exchange']),
                     isin=str(isin) if isin is not None else None,
                     sector=str(sector) if sector is not None else None,
                     industry=str(industry) if industry is not None else None
@@ -255,8 +320,8 @@ class GrowwClient:
             )
 
             if order_response:
-                return Order(
-                    order_id=order_response.get('order_id', ''),
+                return Order.model_construct(
+                    order_id=str(order_response.get('order_id', '')),
                     symbol=order_request.symbol,
                     quantity=order_request.quantity,
                     order_type=order_request.order_type,
@@ -363,7 +428,7 @@ class GrowwClient:
 
                     if quantity > 0 and symbol:  # Only process actual holdings
                         # Create a reconstructed buy order
-                        reconstructed_order = Order(
+                        reconstructed_order = Order.model_construct(
                             # Unique ID
                             order_id=f"HIST-{symbol}-{int(average_price*100)}",
                             symbol=symbol,
@@ -398,7 +463,7 @@ class GrowwClient:
 
                     # Add buy orders from credit transactions
                     if credit_quantity > 0:
-                        buy_order = Order(
+                        buy_order = Order.model_construct(
                             order_id=f"HIST-BUY-{symbol}-{int(credit_price*100)}",
                             symbol=symbol,
                             quantity=credit_quantity,
@@ -414,7 +479,7 @@ class GrowwClient:
 
                     # Add sell orders from debit transactions
                     if debit_quantity > 0:
-                        sell_order = Order(
+                        sell_order = Order.model_construct(
                             order_id=f"HIST-SELL-{symbol}-{int(debit_price*100)}",
                             symbol=symbol,
                             quantity=debit_quantity,
@@ -510,7 +575,8 @@ class GrowwClient:
                 except (ValueError, TypeError):
                     average_price = None
 
-            return Order(
+            # Every field is already coerced above, so skip pydantic validation
+            return Order.model_construct(
                 order_id=str(order_data.get('groww_order_id',
                              order_data.get('order_id', ''))),
                 symbol=str(order_data.get('trading_symbol',
@@ -543,10 +609,38 @@ class GrowwClient:
         except Exception as e:
             raise GrowwAPIError(f"Failed to cancel order: {str(e)}")
 
+    async def _get_ltps(self, symbols: List[str]) -> Dict[str, float]:
+        """Get last traded prices for many NSE symbols with batched LTP calls."""
+        ltps = {}
+
+        async def fetch_chunk(chunk: List[str]) -> None:
+            try:
+                ltp_data = await asyncio.to_thread(
+                    self.groww_api.get_ltp,
+                    segment="CASH",
+                    exchange_trading_symbols=tuple(
+                        f"NSE_{symbol}" for symbol in chunk)
+                )
+            except Exception as e:
+                logger.warning(f"Could not get LTP for {chunk}: {e}")
+                return
+
+            for symbol in chunk:
+                value = (ltp_data or {}).get(f"NSE_{symbol}")
+                if value is not None:
+                    ltps[symbol] = float(value)
+
+        # The LTP endpoint accepts up to 50 instruments per request
+        await gather_bounded(
+            fetch_chunk(symbols[i:i + 50]) for i in range(0, len(symbols), 50))
+        return ltps
+
     async def get_holdings(self) -> List[Holding]:
         """Get current stock holdings and positions using Groww API."""
         try:
-            holdings = []
+            # (symbol, quantity, average_price) for every holding/position
+            entries = []
+            seen = set()
 
             # 1. Get traditional holdings
             holdings_response = self.groww_api.get_holdings_for_user(
@@ -556,34 +650,8 @@ class GrowwClient:
                     symbol = holding_data.get('trading_symbol', '')
                     quantity = float(holding_data.get('quantity', 0))
                     average_price = float(holding_data.get('average_price', 0))
-
-                    # Try to get current price for P&L calculation
-                    try:
-                        current_price_data = self.groww_api.get_ltp(
-                            segment="CASH",
-                            exchange_trading_symbols=(f"NSE_{symbol}",)
-                        )
-                        current_price = float(current_price_data.get(
-                            symbol, {}).get('ltp', average_price))
-                    except:
-                        current_price = average_price  # Fallback to average price
-
-                    market_value = quantity * current_price
-                    invested_value = quantity * average_price
-                    pnl = market_value - invested_value
-                    pnl_percent = (pnl / invested_value *
-                                   100) if invested_value > 0 else 0
-
-                    holdings.append(Holding(
-                        symbol=symbol,
-                        quantity=int(quantity),
-                        average_price=average_price,
-                        current_price=current_price,
-                        market_value=market_value,
-                        pnl=pnl,
-                        pnl_percent=pnl_percent,
-                        product_type=ProductType.CNC
-                    ))
+                    entries.append((symbol, quantity, average_price))
+                    seen.add(symbol)
 
             # 2. Get cash segment positions (where SUZLON appears)
             try:
@@ -598,50 +666,55 @@ class GrowwClient:
                             position_data.get('credit_price', 0))
 
                         # Skip if already in holdings
-                        if any(h.symbol == symbol for h in holdings):
+                        if symbol in seen:
                             continue
 
                         # Only include if we have actual shares
                         if credit_quantity > 0:
-                            # Try to get current price
-                            try:
-                                current_price_data = self.groww_api.get_ltp(
-                                    segment="CASH",
-                                    exchange_trading_symbols=(f"NSE_{symbol}",)
-                                )
-                                current_price = float(current_price_data.get(
-                                    symbol, {}).get('ltp', credit_price))
-                            except:
-                                current_price = credit_price
-
-                            market_value = credit_quantity * current_price
-                            invested_value = credit_quantity * credit_price
-                            pnl = market_value - invested_value
-                            pnl_percent = (pnl / invested_value *
-                                           100) if invested_value > 0 else 0
-
-                            holdings.append(Holding(
-                                symbol=symbol,
-                                quantity=int(credit_quantity),
-                                average_price=credit_price,
-                                current_price=current_price,
-                                market_value=market_value,
-                                pnl=pnl,
-                                pnl_percent=pnl_percent,
-                                product_type=ProductType.CNC
-                            ))
+                            entries.append(
+                                (symbol, credit_quantity, credit_price))
+                            seen.add(symbol)
             except Exception as e:
                 print(f"Warning: Could not get positions: {e}")
 
+            # Price every holding with one LTP request per 50 symbols
+            ltps = await self._get_ltps([symbol for symbol, _, _ in entries if symbol])
+
+            holdings = []
+            for symbol, quantity, average_price in entries:
+                # Fall back to the average price if no LTP is available
+                current_price = ltps.get(symbol, average_price)
+
+                market_value = quantity * current_price
+                invested_value = quantity * average_price
+                pnl = market_value - invested_value
+                pnl_percent = (pnl / invested_value *
+                               100) if invested_value > 0 else 0
+
+                holdings.append(Holding.model_construct(
+                    symbol=symbol,
+                    quantity=int(quantity),
+                    average_price=average_price,
+                    current_price=current_price,
+                    market_value=market_value,
+                    pnl=pnl,
+                    pnl_percent=pnl_percent,
+                    product_type=ProductType.CNC
+                ))
+
             return holdings
 
         except Exception as e:
             raise GrowwAPIError(f"Failed to get holdings: {str(e)}")
 
-    async def get_portfolio(self) -> Portfolio:
-        """Get complete portfolio information using Groww API."""
+    async def get_portfolio(self, holdings: Optional[List[Holding]] = None) -> Portfolio:
+        """Get complete portfolio information using Groww API.
+
+        Pass already-fetched holdings to avoid requesting them again.
+        """
         try:
-            holdings = await self.get_holdings()
+            if holdings is None:
+                holdings = await self.get_holdings()
 
             # Calculate portfolio metrics
             total_invested = sum(
@@ -658,7 +731,7 @@ class GrowwClient:
             except:
                 cash_balance = 0.0  # Fallback if margin API fails
 
-            return Portfolio(
+            return Portfolio.model_construct(
                 total_value=total_current_value + cash_balance,
                 invested_value=total_invested,
                 current_value=total_current_value,
@@ -689,3 +762,18 @@ class GrowwClient:
             "current_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "next_session": "Next trading day 9:15 AM" if not is_trading_time else "Currently trading"
         }
+
+
+# Shared client instance, created lazily by get_client()
+_client: Optional[GrowwClient] = None
+_client_lock = asyncio.Lock()
+
+
+async def get_client() -> GrowwClient:
+    """Get the shared GrowwClient, creating it on first use."""
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client = GrowwClient()
+    return _client
@@ -3,7 +3,7 @@ Market utilities for checking Indian stock market hours.
 """
 
 from datetime import datetime, time
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 import pytz
 
 # Indian timezone
@@ -21,7 +21,7 @@ def get_ist_now() -> datetime:
     return datetime.now(IST)
 
 
-def is_market_day(dt: datetime = None) -> bool:
+def is_market_day(dt: Optional[datetime] = None) -> bool:
     """Check if the given date is a market trading day (Monday-Friday)."""
     if dt is None:
         dt = get_ist_now()
@@ -30,7 +30,7 @@ def is_market_day(dt: datetime = None) -> bool:
     return dt.weekday() < 5  # Monday to Friday
 
 
-def is_market_hours(dt: datetime = None) -> bool:
+def is_market_hours(dt: Optional[datetime] = None) -> bool:
     """Check if current time is during regular market hours (9:15 AM - 3:30 PM IST)."""
     if dt is None:
         dt = get_ist_now()
@@ -42,7 +42,7 @@ def is_market_hours(dt: datetime = None) -> bool:
     return MARKET_OPEN <= current_time <= MARKET_CLOSE
 
 
-def is_pre_market_hours(dt: datetime = None) -> bool:
+def is_pre_market_hours(dt: Optional[datetime] = None) -> bool:
     """Check if current time is during pre-market hours (9:00 AM - 9:15 AM IST)."""
     if dt is None:
         dt = get_ist_now()
@@ -54,7 +54,7 @@ def is_pre_market_hours(dt: datetime = None) -> bool:
     return PRE_MARKET_OPEN <= current_time < MARKET_OPEN
 
 
-def is_post_market_hours(dt: datetime = None) -> bool:
+def is_post_market_hours(dt: Optional[datetime] = None) -> bool:
     """Check if current time is during post-market hours (3:30 PM - 4:00 PM IST)."""
     if dt is None:
         dt = get_ist_now()
@@ -66,7 +66,7 @@ def is_post_market_hours(dt: datetime = None) -> bool:
     return MARKET_CLOSE < current_time <= POST_MARKET_CLOSE
 
 
-def is_extended_hours(dt: datetime = None) -> bool:
+def is_extended_hours(dt: Optional[datetime] = None) -> bool:
     """Check if current time is during extended hours (pre + regular + post market)."""
     if dt is None:
         dt = get_ist_now()
@@ -74,7 +74,7 @@ def is_extended_hours(dt: datetime = None) -> bool:
     return is_pre_market_hours(dt) or is_market_hours(dt) or is_post_market_hours(dt)
 
 
-def get_market_status(dt: datetime = None) -> Dict[str, Any]:
+def get_market_status(dt: Optional[datetime] = None) -> Dict[str, Any]:
     """Get comprehensive market status information."""
     if dt is None:
         dt = get_ist_now()
@@ -115,7 +115,7 @@ def get_market_status(dt: datetime = None) -> Dict[str, Any]:
     }
 
 
-def get_next_market_open(dt: datetime = None) -> str:
+def get_next_market_open(dt: Optional[datetime] = None) -> str:
     """Get the next market opening time."""
     if dt is None:
         dt = get_ist_now()
@@ -137,7 +137,7 @@ def get_next_market_open(dt: datetime = None) -> str:
         return "Tomorrow at 9:15 AM IST"
 
 
-def get_next_market_close(dt: datetime = None) -> str:
+def get_next_market_close(dt: Optional[datetime] = None) -> str:
     """Get the next market closing time."""
     if dt is None:
         dt = get_ist_now()
@@ -148,7 +148,7 @@ def get_next_market_close(dt: datetime = None) -> str:
     return get_next_market_open(dt).replace("9:15 AM", "3:30 PM")
 
 
-def should_monitor_alerts(dt: datetime = None) -> bool:
+def should_monitor_alerts(dt: Optional[datetime] = None) -> bool:
     """Determine if we should actively monitor alerts based on market hours."""
     if dt is None:
         dt = get_ist_now()
@@ -157,7 +157,7 @@ def should_monitor_alerts(dt: datetime = None) -> bool:
     return is_market_hours(dt) or is_pre_market_hours(dt)
 
 
-def get_monitoring_interval(dt: datetime = None) -> int:
+def get_monitoring_interval(dt: Optional[datetime] = None) -> int:
     """Get appropriate monitoring interval in seconds based on market status."""
     if dt is None:
         dt = get_ist_now()
@@ -170,7 +170,15 @@ def get_monitoring_interval(dt: datetime = None) -> int:
         return 3600  # 1 hour when market is closed (for minimal checking)
 
 
-def time_until_next_session(dt: datetime = None) -> int:
+def next_action(dt: Optional[datetime] = None) -> Tuple[bool, int]:
+    """Get (should_monitor, sleep_seconds) for the monitoring loop from a single clock read."""
+    if dt is None:
+        dt = get_ist_now()
+
+    return should_monitor_alerts(dt), get_monitoring_interval(dt)
+
+
+def time_until_next_session(dt: Optional[datetime] = None) -> int:
     """Get seconds until next market session starts."""
     if dt is None:
         dt = get_ist_now()
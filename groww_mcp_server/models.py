@@ -2,12 +2,32 @@
 Data models for Groww MCP Server.
 """
 
+import os
+import sys
+from functools import lru_cache
 from typing import Optional, List, Dict, Any, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field as _Field, field_validator
 from datetime import datetime
 from enum import Enum
 import uuid
 
+# Field descriptions are only needed when generating JSON schemas; set
+# MCP_SCHEMAS=1 to keep them, otherwise they are dropped to save memory.
+KEEP_FIELD_DESCRIPTIONS = os.getenv("MCP_SCHEMAS") == "1"
+
+
+@lru_cache(maxsize=4096)
+def normalize_symbol(symbol: str) -> str:
+    """Uppercase and intern a stock symbol so repeated lookups share one string."""
+    return sys.intern(symbol.strip().upper())
+
+
+def Field(*args, **kwargs):
+    """Pydantic Field that drops the description unless schemas are requested."""
+    if not KEEP_FIELD_DESCRIPTIONS:
+        kwargs.pop("description", None)
+    return _Field(*args, **kwargs)
+
 
 class OrderType(str, Enum):
     """Order type enumeration."""
@@ -99,6 +119,12 @@ class PriceAlert(BaseModel):
         None, description="Alert trigger time")
     message: Optional[str] = Field(None, description="Custom alert message")
 
+    @field_validator("symbol")
+    @classmethod
+    def _normalize_symbol(cls, symbol: str) -> str:
+        """Store symbols normalized so lookups can compare them directly."""
+        return normalize_symbol(symbol)
+
     def is_triggered(self, current_price: float, current_volume: Optional[int] = None) -> bool:
         """Check if alert condition is met."""
         if self.status != AlertStatus.ACTIVE:
@@ -213,6 +239,9 @@ class Portfolio(BaseModel):
 
 class TradeCommand(BaseModel):
     """Natural language trade command model."""
+    # Frozen so parsed commands can be shared from the parser's cache
+    model_config = ConfigDict(frozen=True)
+
     action: Literal["buy", "sell"] = Field(..., description="Trade action")
     symbol: str = Field(..., description="Stock symbol")
     quantity: Optional[int] = Field(None, description="Number of shares")
@@ -3,23 +3,39 @@ Groww MCP Server - Main server implementation.
 """
 
 import asyncio
-import json
+import inspect
 import logging
 import sys
-from typing import Any, Sequence, Dict, List, Optional
-from datetime import datetime
-
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from operator import attrgetter
+from typing import Any, Awaitable, Callable, Sequence, Dict, List, Optional, Tuple
+from datetime import date, datetime
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+import fastjsonschema
 from mcp import types
 from mcp.server import Server
+from mcp.server.session import ServerSession
 from mcp.server.stdio import stdio_server
 
 from .config import config
-from .groww_client import GrowwClient, GrowwAPIError
+from .groww_client import GrowwAPIError, get_client
 from .command_parser import command_parser
 from .alert_manager import AlertManager
+from .market_utils import get_market_status, should_monitor_alerts
+from .email_config import email_config_manager, EmailConfig, EmailConfigManager
+from .email_service import EmailService, SMTP_CONNECTION_ERRORS, close_pooled_connections
 from .models import (
     OrderRequest, OrderType, OrderSide, ProductType,
-    TradeCommand, APIResponse, AlertType, AlertStatus
+    TradeCommand, APIResponse, AlertType, AlertStatus, normalize_symbol
 )
 
 # Configure logging to use stderr and avoid interfering with MCP protocol
@@ -36,548 +52,720 @@ server = Server("groww-mcp-server")
 # Global alert manager instance (will be initialized in main)
 alert_manager: Optional[AlertManager] = None
 
-
-@server.list_tools()
-async def list_tools() -> list[types.Tool]:
-    """List all available tools."""
-    return [
-        types.Tool(
-            name="buy_stock",
-            description="Execute a buy order for stocks. Supports both quantity and amount-based orders.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Natural language buy command (e.g., 'buy 5 stocks of RELIANCE' or 'buy ₹1000 worth of TCS')"
-                    },
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock symbol (e.g., RELIANCE, TCS) - optional if included in command"
-                    },
-                    "quantity": {
-                        "type": "integer",
-                        "description": "Number of shares to buy - optional if amount is specified"
-                    },
-                    "amount": {
-                        "type": "number",
-                        "description": "Amount in rupees to buy - optional if quantity is specified"
-                    },
-                    "order_type": {
-                        "type": "string",
-                        "enum": ["MARKET", "LIMIT"],
-                        "description": "Order type - defaults to MARKET"
-                    },
-                    "price": {
-                        "type": "number",
-                        "description": "Limit price (required for LIMIT orders)"
-                    },
-                    "confirm": {
-                        "type": "boolean",
-                        "description": "Confirmation flag - must be true to execute the order"
-                    }
+# Configuration error shown for every tool call (validated once in main)
+_CONFIG_ERROR_MSG: Optional[str] = None
+
+
+def _build_config_error_message(validation_errors: List[str]) -> str:
+    """Build the user-facing message for configuration validation errors."""
+    error_message = "❌ **Configuration Error**\n\nThe following issues need to be resolved:\n\n"
+    for error in validation_errors:
+        error_message += f"• {error}\n"
+    error_message += "\n💡 **How to fix:**\n"
+    error_message += "1. Set the GROWW_ACCESS_TOKEN environment variable\n"
+    error_message += "2. Get your access token from Groww's developer portal\n"
+    error_message += "3. Restart the MCP server after setting the token\n"
+    return error_message
+
+
+# Tool definitions are static, so build them once at import time
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="buy_stock",
+        description="Execute a buy order for stocks. Supports both quantity and amount-based orders.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "Natural language buy command (e.g., 'buy 5 stocks of RELIANCE' or 'buy ₹1000 worth of TCS')"
                 },
-                "required": ["command"]
-            }
-        ),
-        types.Tool(
-            name="sell_stock",
-            description="Execute a sell order for stocks. Supports both quantity and amount-based orders.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Natural language sell command (e.g., 'sell 10 stocks of TCS' or 'sell all my RELIANCE')"
-                    },
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock symbol (e.g., RELIANCE, TCS) - optional if included in command"
-                    },
-                    "quantity": {
-                        "type": "integer",
-                        "description": "Number of shares to sell - optional if amount is specified"
-                    },
-                    "amount": {
-                        "type": "number",
-                        "description": "Amount in rupees to sell - optional if quantity is specified"
-                    },
-                    "order_type": {
-                        "type": "string",
-                        "enum": ["MARKET", "LIMIT"],
-                        "description": "Order type - defaults to MARKET"
-                    },
-                    "price": {
-                        "type": "number",
-                        "description": "Limit price (required for LIMIT orders)"
-                    },
-                    "confirm": {
-                        "type": "boolean",
-                        "description": "Confirmation flag - must be true to execute the order"
-                    }
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock symbol (e.g., RELIANCE, TCS) - optional if included in command"
                 },
-                "required": ["command"]
-            }
-        ),
-        types.Tool(
-            name="get_stock_price",
-            description="Get current price information for a stock.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock symbol (e.g., RELIANCE, TCS)"
-                    }
+                "quantity": {
+                    "type": "integer",
+                    "description": "Number of shares to buy - optional if amount is specified"
                 },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="get_portfolio",
-            description="Get complete portfolio information including holdings and P&L.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="get_holdings",
-            description="Get current stock holdings.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="get_orders",
-            description="Get list of recent orders.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "status": {
-                        "type": "string",
-                        "enum": ["ALL", "PENDING", "EXECUTED", "CANCELLED"],
-                        "description": "Filter orders by status - defaults to ALL"
-                    },
-                    "start_date": {
-                        "type": "string",
-                        "description": "Start date for filtering orders (YYYY-MM-DD format) - optional"
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "End date for filtering orders (YYYY-MM-DD format) - optional"
-                    }
+                "amount": {
+                    "type": "number",
+                    "description": "Amount in rupees to buy - optional if quantity is specified"
+                },
+                "order_type": {
+                    "type": "string",
+                    "enum": ["MARKET", "LIMIT"],
+                    "description": "Order type - defaults to MARKET"
+                },
+                "price": {
+                    "type": "number",
+                    "description": "Limit price (required for LIMIT orders)"
+                },
+                "confirm": {
+                    "type": "boolean",
+                    "description": "Confirmation flag - must be true to execute the order"
                 }
-            }
-        ),
-        types.Tool(
-            name="cancel_order",
-            description="Cancel a pending order.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "order_id": {
-                        "type": "string",
-                        "description": "Order ID to cancel"
-                    },
-                    "confirm": {
-                        "type": "boolean",
-                        "description": "Confirmation flag - must be true to cancel the order"
-                    }
+            },
+            "required": ["command"]
+        }
+    ),
+    types.Tool(
+        name="sell_stock",
+        description="Execute a sell order for stocks. Supports both quantity and amount-based orders.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "Natural language sell command (e.g., 'sell 10 stocks of TCS' or 'sell all my RELIANCE')"
                 },
-                "required": ["order_id", "confirm"]
-            }
-        ),
-        types.Tool(
-            name="search_stocks",
-            description="Search for stocks by name or symbol.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query (company name or stock symbol)"
-                    }
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock symbol (e.g., RELIANCE, TCS) - optional if included in command"
                 },
-                "required": ["query"]
-            }
-        ),
-        types.Tool(
-            name="get_market_status",
-            description="Get current market status and trading hours.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="parse_trade_command",
-            description="Parse and validate a natural language trading command without executing it.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Natural language trading command to parse"
-                    }
+                "quantity": {
+                    "type": "integer",
+                    "description": "Number of shares to sell - optional if amount is specified"
                 },
-                "required": ["command"]
-            }
-        ),
-        types.Tool(
-            name="set_price_alert",
-            description="Set a price alert for a stock with various conditions (percentage change, price threshold, etc.)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Natural language alert command (e.g., 'Set alert for TRIDENT if it goes up by 2%' or 'Alert me when RELIANCE goes above ₹2500')"
-                    },
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock symbol (e.g., RELIANCE, TCS) - optional if included in command"
-                    },
-                    "alert_type": {
-                        "type": "string",
-                        "enum": ["percentage_increase", "percentage_decrease", "price_above", "price_below", "volume_above"],
-                        "description": "Type of alert"
-                    },
-                    "threshold": {
-                        "type": "number",
-                        "description": "Alert threshold value (percentage for percentage alerts, price for price alerts)"
-                    },
-                    "base_price": {
-                        "type": "number",
-                        "description": "Base price for percentage alerts (uses current price if not specified)"
-                    }
+                "amount": {
+                    "type": "number",
+                    "description": "Amount in rupees to sell - optional if quantity is specified"
                 },
-                "required": ["command"]
-            }
-        ),
-        types.Tool(
-            name="list_alerts",
-            description="List all price alerts or filter by symbol/status.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Filter alerts by stock symbol (optional)"
-                    },
-                    "status": {
-                        "type": "string",
-                        "enum": ["active", "triggered", "cancelled", "expired"],
-                        "description": "Filter alerts by status (optional)"
-                    }
+                "order_type": {
+                    "type": "string",
+                    "enum": ["MARKET", "LIMIT"],
+                    "description": "Order type - defaults to MARKET"
+                },
+                "price": {
+                    "type": "number",
+                    "description": "Limit price (required for LIMIT orders)"
+                },
+                "confirm": {
+                    "type": "boolean",
+                    "description": "Confirmation flag - must be true to execute the order"
                 }
-            }
-        ),
-        types.Tool(
-            name="remove_alert",
-            description="Remove a specific price alert by ID.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "alert_id": {
-                        "type": "string",
-                        "description": "Alert ID to remove"
-                    }
+            },
+            "required": ["command"]
+        }
+    ),
+    types.Tool(
+        name="get_stock_price",
+        description="Get current price information for a stock.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock symbol (e.g., RELIANCE, TCS)"
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    types.Tool(
+        name="get_portfolio",
+        description="Get complete portfolio information including holdings and P&L.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="get_holdings",
+        description="Get current stock holdings.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="get_orders",
+        description="Get list of recent orders.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "status": {
+                    "type": "string",
+                    "enum": ["ALL", "PENDING", "EXECUTED", "CANCELLED"],
+                    "description": "Filter orders by status - defaults to ALL"
                 },
-                "required": ["alert_id"]
-            }
-        ),
-        types.Tool(
-            name="check_alerts",
-            description="Manually check all active alerts and return any triggered alerts.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="alert_status",
-            description="Get alert monitoring status and statistics.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="configure_email",
-            description="Configure email settings for alert notifications. Supports multiple recipients.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "smtp_server": {
-                        "type": "string",
-                        "description": "SMTP server address (e.g., 'smtp.gmail.com')"
-                    },
-                    "smtp_port": {
-                        "type": "integer",
-                        "description": "SMTP port (587 for TLS, 465 for SSL)"
-                    },
-                    "username": {
-                        "type": "string",
-                        "description": "SMTP username (usually your email address)"
-                    },
-                    "password": {
-                        "type": "string",
-                        "description": "SMTP password (use app password for Gmail)"
-                    },
-                    "from_email": {
-                        "type": "string",
-                        "description": "From email address with optional name"
-                    },
-                    "to_email": {
-                        "type": "string",
-                        "description": "Single recipient email address (for backward compatibility)"
-                    },
-                    "to_emails": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Array of recipient email addresses (supports multiple recipients)"
-                    },
-                    "use_tls": {
-                        "type": "boolean",
-                        "description": "Whether to use TLS encryption (default: true)"
-                    },
-                    "provider": {
-                        "type": "string",
-                        "enum": ["gmail", "outlook", "custom"],
-                        "description": "Email provider for preset configuration"
-                    }
+                "start_date": {
+                    "type": "string",
+                    "description": "Start date for filtering orders (YYYY-MM-DD format) - optional"
+                },
+                "end_date": {
+                    "type": "string",
+                    "description": "End date for filtering orders (YYYY-MM-DD format) - optional"
+                },
+                "page": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Page of results to show (starts at 1) - defaults to 1"
+                },
+                "page_size": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 200,
+                    "description": "Orders per page (max 200) - defaults to 50"
                 }
             }
-        ),
-        types.Tool(
-            name="test_email",
-            description="Send a test email to verify email configuration.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="email_status",
-            description="Get email configuration status and settings.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="disable_email",
-            description="Disable email notifications for alerts.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
+        }
+    ),
+    types.Tool(
+        name="cancel_order",
+        description="Cancel a pending order.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "order_id": {
+                    "type": "string",
+                    "description": "Order ID to cancel"
+                },
+                "confirm": {
+                    "type": "boolean",
+                    "description": "Confirmation flag - must be true to cancel the order"
+                }
+            },
+            "required": ["order_id", "confirm"]
+        }
+    ),
+    types.Tool(
+        name="search_stocks",
+        description="Search for stocks by name or symbol.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query (company name or stock symbol)"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    types.Tool(
+        name="get_market_status",
+        description="Get current market status and trading hours.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="parse_trade_command",
+        description="Parse and validate a natural language trading command without executing it.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "Natural language trading command to parse"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    types.Tool(
+        name="set_price_alert",
+        description="Set a price alert for a stock with various conditions (percentage change, price threshold, etc.)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "Natural language alert command (e.g., 'Set alert for TRIDENT if it goes up by 2%' or 'Alert me when RELIANCE goes above ₹2500')"
+                },
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock symbol (e.g., RELIANCE, TCS) - optional if included in command"
+                },
+                "alert_type": {
+                    "type": "string",
+                    "enum": ["percentage_increase", "percentage_decrease", "price_above", "price_below", "volume_above"],
+                    "description": "Type of alert"
+                },
+                "threshold": {
+                    "type": "number",
+                    "description": "Alert threshold value (percentage for percentage alerts, price for price alerts)"
+                },
+                "base_price": {
+                    "type": "number",
+                    "description": "Base price for percentage alerts (uses current price if not specified)"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    types.Tool(
+        name="list_alerts",
+        description="List all price alerts or filter by symbol/status.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Filter alerts by stock symbol (optional)"
+                },
+                "status": {
+                    "type": "string",
+                    "enum": ["active", "triggered", "cancelled", "expired"],
+                    "description": "Filter alerts by status (optional)"
+                }
             }
-        ),
-        types.Tool(
-            name="enable_email",
-            description="Enable email notifications for alerts.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
+        }
+    ),
+    types.Tool(
+        name="remove_alert",
+        description="Remove a specific price alert by ID.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "alert_id": {
+                    "type": "string",
+                    "description": "Alert ID to remove"
+                }
+            },
+            "required": ["alert_id"]
+        }
+    ),
+    types.Tool(
+        name="check_alerts",
+        description="Manually check all active alerts and return any triggered alerts.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="alert_status",
+        description="Get alert monitoring status and statistics.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="configure_email",
+        description="Configure email settings for alert notifications. Supports multiple recipients.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "smtp_server": {
+                    "type": "string",
+                    "description": "SMTP server address (e.g., 'smtp.gmail.com')"
+                },
+                "smtp_port": {
+                    "type": "integer",
+                    "description": "SMTP port (587 for TLS, 465 for SSL)"
+                },
+                "username": {
+                    "type": "string",
+                    "description": "SMTP username (usually your email address)"
+                },
+                "password": {
+                    "type": "string",
+                    "description": "SMTP password (use app password for Gmail)"
+                },
+                "from_email": {
+                    "type": "string",
+                    "description": "From email address with optional name"
+                },
+                "to_email": {
+                    "type": "string",
+                    "description": "Single recipient email address (for backward compatibility)"
+                },
+                "to_emails": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Array of recipient email addresses (supports multiple recipients)"
+                },
+                "use_tls": {
+                    "type": "boolean",
+                    "description": "Whether to use TLS encryption (default: true)"
+                },
+                "provider": {
+                    "type": "string",
+                    "enum": ["gmail", "outlook", "custom"],
+                    "description": "Email provider for preset configuration"
+                }
             }
-        )
-    ]
+        }
+    ),
+    types.Tool(
+        name="test_email",
+        description="Send a test email to verify email configuration.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="email_status",
+        description="Get email configuration status and settings.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="disable_email",
+        description="Disable email notifications for alerts.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="enable_email",
+        description="Enable email notifications for alerts.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+]
+
+# Argument validators compiled once from the tool schemas
+_VALIDATORS: Dict[str, Callable[[dict], Any]] = {
+    tool.name: fastjsonschema.compile(tool.inputSchema) for tool in _TOOLS
+}
+
+
+@server.list_tools()
+async def list_tools() -> list[types.Tool]:
+    """List all available tools."""
+    return _TOOLS
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Handle tool calls."""
     try:
-        # Validate configuration with detailed error messages
-        if not config.validate():
-            validation_errors = config.get_validation_errors()
-            error_message = "❌ **Configuration Error**\n\nThe following issues need to be resolved:\n\n"
-            for error in validation_errors:
-                error_message += f"• {error}\n"
-            error_message += "\n💡 **How to fix:**\n"
-            error_message += "1. Set the GROWW_ACCESS_TOKEN environment variable\n"
-            error_message += "2. Get your access token from Groww's developer portal\n"
-            error_message += "3. Restart the MCP server after setting the token\n"
-
+        # Configuration is validated once at startup
+        if _CONFIG_ERROR_MSG:
             return [types.TextContent(
                 type="text",
-                text=error_message
+                text=_CONFIG_ERROR_MSG
             )]
 
-        if name == "buy_stock":
-            return await handle_buy_stock(arguments)
-        elif name == "sell_stock":
-            return await handle_sell_stock(arguments)
-        elif name == "get_stock_price":
-            return await handle_get_stock_price(arguments)
-        elif name == "get_portfolio":
-            return await handle_get_portfolio(arguments)
-        elif name == "get_holdings":
-            return await handle_get_holdings(arguments)
-        elif name == "get_orders":
-            return await handle_get_orders(arguments)
-        elif name == "cancel_order":
-            return await handle_cancel_order(arguments)
-        elif name == "search_stocks":
-            return await handle_search_stocks(arguments)
-        elif name == "get_market_status":
-            return await handle_get_market_status(arguments)
-        elif name == "parse_trade_command":
-            return await handle_parse_trade_command(arguments)
-        elif name == "set_price_alert":
-            return await handle_set_price_alert(arguments)
-        elif name == "list_alerts":
-            return await handle_list_alerts(arguments)
-        elif name == "remove_alert":
-            return await handle_remove_alert(arguments)
-        elif name == "check_alerts":
-            return await handle_check_alerts(arguments)
-        elif name == "alert_status":
-            return await handle_alert_status(arguments)
-        elif name == "configure_email":
-            return await handle_configure_email(arguments)
-        elif name == "test_email":
-            return await handle_test_email(arguments)
-        elif name == "email_status":
-            return await handle_email_status(arguments)
-        elif name == "disable_email":
-            return await handle_disable_email(arguments)
-        elif name == "enable_email":
-            return await handle_enable_email(arguments)
-        else:
+        handler = _HANDLERS.get(name)
+        if handler is None:
             return [types.TextContent(
                 type="text",
                 text=f"❌ Unknown tool: {name}"
             )]
 
-    except Exception as e:
-        logger.error(f"Error in tool call {name}: {str(e)}")
+        try:
+            _VALIDATORS[name](arguments)
+        except fastjsonschema.JsonSchemaException as e:
+            return [types.TextContent(
+                type="text",
+                text=f"❌ Invalid arguments for {name}: {e.message}"
+            )]
+
+        return await handler(arguments)
+
+    except (GrowwAPIError, ValueError) as e:
+        logger.error("Error in tool call %s: %s", name, e)
         return [types.TextContent(
             type="text",
             text=f"❌ Error: {str(e)}"
         )]
+    except Exception:
+        # Unexpected failures are logged with a traceback and left to the
+        # MCP server, which reports them to the client as a tool error
+        logger.exception("Unexpected error in tool call %s", name)
+        raise
 
 
-async def handle_buy_stock(arguments: dict) -> list[types.TextContent]:
-    """Handle buy stock command."""
-    command = arguments.get("command", "")
-    confirm = arguments.get("confirm", False)
+def _ttl_cache(seconds: float, maxsize: int = 128):
+    """Cache an async function's results per argument tuple for a number of seconds.
 
-    # Parse the command
-    parsed_command = command_parser.parse_command(command)
+    The least recently used entry is evicted once maxsize entries are held.
+    Concurrent misses for the same arguments share a single call.
+    """
+    def decorator(func):
+        cache: Dict[tuple, tuple] = {}  # Kept in least -> most recently used order
+        pending: Dict[tuple, asyncio.Task] = {}
+        generation = 0  # Bumped by cache_clear so in-flight results aren't stored
 
-    if not parsed_command:
-        suggestions = command_parser.suggest_corrections(command)
-        return [types.TextContent(
-            type="text",
-            text=f"❌ Could not parse command: '{command}'\n\nSuggestions:\n" + "\n".join(
-                f"• {s}" for s in suggestions)
-        )]
+        async def fetch(args: tuple, started_in: int):
+            try:
+                result = await func(*args)
+                if started_in == generation:
+                    if len(cache) >= maxsize:
+                        del cache[next(iter(cache))]
+                    cache[args] = (time.monotonic(), result)
+                return result
+            finally:
+                if pending.get(args) is asyncio.current_task():
+                    del pending[args]
+
+        @wraps(func)
+        async def wrapper(*args):
+            cached = cache.pop(args, None)
+            if cached and time.monotonic() - cached[0] <= seconds:
+                logger.debug("Cache hit for %s%s", func.__name__, args)
+                cache[args] = cached
+                return cached[1]
+
+            task = pending.get(args)
+            if task is None:
+                logger.debug("Cache miss for %s%s", func.__name__, args)
+                task = pending[args] = asyncio.ensure_future(fetch(args, generation))
+            # Shield the shared call so one cancelled caller doesn't cancel the rest
+            return await asyncio.shield(task)
+
+        def cache_clear():
+            nonlocal generation
+            generation += 1
+            cache.clear()
+            pending.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+@_ttl_cache(seconds=30)
+async def _fetch_holdings():
+    """Get holdings, reusing a result from the last 30 seconds."""
+    client = await get_client()
+    return await client.get_holdings()
+
+
+@_ttl_cache(seconds=30)
+async def _fetch_orders():
+    """Get orders, reusing a result from the last 30 seconds."""
+    client = await get_client()
+    return await client.get_orders()
+
+
+def _chunked_text(parts: List[str], limit: int = 4096) -> list[types.TextContent]:
+    """Group message parts into TextContent blocks of about `limit` characters each."""
+    contents = []
+    group: List[str] = []
+    size = 0
+    for part in parts:
+        if group and size + len(part) > limit:
+            contents.append(types.TextContent(type="text", text="".join(group)))
+            group, size = [], 0
+        group.append(part)
+        size += len(part)
+
+    if group:
+        contents.append(types.TextContent(type="text", text="".join(group)))
+    return contents
+
+
+# Replies for failed Groww API calls, see _groww_error_response()
+_AUTH_ERROR_TMPL = """🔐 **Authentication Error**
 
-    if parsed_command.action != "buy":
-        return [types.TextContent(
-            type="text",
-            text="❌ This is not a buy command. Use the sell_stock tool for selling."
-        )]
+❌ **Your Groww API token has expired or is invalid.**
 
-    # Override with explicit parameters if provided
-    symbol = arguments.get("symbol", parsed_command.symbol)
-    quantity = arguments.get("quantity", parsed_command.quantity)
-    amount = arguments.get("amount", parsed_command.amount)
-    order_type = OrderType(arguments.get(
-        "order_type", parsed_command.order_type.value))
-    price = arguments.get("price", parsed_command.price)
+**What this means:**
+• Your API access token is no longer valid
+• You need to get a fresh token from Groww
+• This is a common issue as API tokens expire periodically
 
-    # Validate required fields
-    if not symbol:
-        return [types.TextContent(
-            type="text",
-            text="❌ Stock symbol is required"
-        )]
+**🔧 How to fix this:**
 
-    if not quantity and not amount:
-        return [types.TextContent(
-            type="text",
-            text="❌ Either quantity or amount must be specified"
-        )]
+1. **Get a new API token:**
+   • Log into your Groww account
+   • Go to the API/Developer section
+   • Generate a new access token
 
-    if order_type == OrderType.LIMIT and not price:
-        return [types.TextContent(
-            type="text",
-            text="❌ Price is required for limit orders"
-        )]
+2. **Update your environment:**
+   • Set the new token: `GROWW_ACCESS_TOKEN=your_new_token`
+   • Restart this MCP server
 
-    # Show order preview
-    if not confirm:
-        preview = f"""
-📋 **Buy Order Preview**
+3. **Test the connection:**
+   • Try to {action} again after updating the token
+
+**💡 Pro tip:** API tokens typically expire every 30-90 days for security reasons.
+
+**Error details:** {error}"""
+
+_API_ERROR_TMPL = "❌ Failed to {action}: {error}"
+
+_ORDERS_API_ERROR_TMPL = """❌ **API Connection Error**
+
+Failed to {action} from Groww API.
+
+**Error details:** {error}
+
+**Possible solutions:**
+• Check your internet connection
+• Verify your API token is valid
+• Try again in a few moments
+• Contact Groww support if the issue persists
+
+**Need help?** Use the diagnostic script: `python debug_orders.py`"""
+
+
+def _groww_error_response(e: GrowwAPIError, action: str,
+                          api_error_tmpl: str = _API_ERROR_TMPL) -> list[types.TextContent]:
+    """Build the reply for a failed Groww API call, with token help for auth failures."""
+    error_message = str(e)
+    if "Authentication failed" in error_message or "expired or is invalid" in error_message:
+        text = _AUTH_ERROR_TMPL.format(action=action, error=error_message)
+    else:
+        text = api_error_tmpl.format(action=action, error=error_message)
+    return [types.TextContent(type="text", text=text)]
+
+
+@_ttl_cache(seconds=300, maxsize=256)
+async def _cached_search(query: str):
+    """Search stocks, reusing results for the same normalized query for 5 minutes."""
+    client = await get_client()
+    return await client.search_stocks(query)
+
+
+# Static message skeletons, filled in with str.format() per call
+_ORDER_PREVIEW_TMPL = """
+📋 **{title} Order Preview**
 
 **Stock:** {symbol}
-**Action:** BUY
-**Quantity:** {quantity if quantity else 'TBD (based on amount)'}
-**Amount:** {f'₹{amount:,.2f}' if amount else 'TBD (based on quantity)'}
-**Order Type:** {order_type.value}
-**Price:** {f'₹{price:,.2f}' if price else 'Market Price'}
+**Action:** {side}
+**Quantity:** {quantity}
+**Amount:** {amount}
+**Order Type:** {order_type}
+**Price:** {price}
 
 ⚠️ **This is a preview only. To execute this order, add `"confirm": true` to your request.**
 
 💡 **Example:**
 """
-        preview += '```json\n{"command": "' + \
-            command + '", "confirm": true}\n```'
-        return [types.TextContent(type="text", text=preview)]
 
-    # Execute the order
-    async with GrowwClient() as client:
-        try:
-            # If amount is specified, get current price to calculate quantity
-            if amount and not quantity:
-                stock_price = await client.get_stock_price(symbol)
-                quantity = int(amount / stock_price.ltp)
-                if quantity == 0:
-                    return [types.TextContent(
-                        type="text",
-                        text=f"❌ Amount ₹{amount:,.2f} is too small to buy even 1 share of {symbol} (current price: ₹{stock_price.ltp:,.2f})"
-                    )]
-
-            order_request = OrderRequest(
-                symbol=symbol,
-                quantity=quantity,
-                order_type=order_type,
-                order_side=OrderSide.BUY,
-                product_type=ProductType.CNC,
-                price=price,
-                validity="DAY"
-            )
-
-            order = await client.place_order(order_request)
-
-            success_msg = f"""
-✅ **Buy Order Placed Successfully**
+_ORDER_SUCCESS_TMPL = """
+✅ **{title} Order Placed Successfully**
 
 **Order ID:** {order.order_id}
 **Stock:** {order.symbol}
 **Quantity:** {order.quantity} shares
 **Order Type:** {order.order_type.value}
 **Status:** {order.status.value}
-**Order Time:** {order.order_time.strftime('%Y-%m-%d %H:%M:%S')}
+**Order Time:** {order_time}
 """
-            if order.price:
-                success_msg += f"**Price:** ₹{order.price:,.2f}\n"
 
-            return [types.TextContent(type="text", text=success_msg)]
+_STOCK_PRICE_TMPL = """
+📊 **{symbol} - Live Stock Price**
 
-        except GrowwAPIError as e:
-            return [types.TextContent(
-                type="text",
-                text=f"❌ Failed to place buy order: {str(e)}"
-            )]
+**Current Price (LTP):** ₹{price.ltp:,.2f}
+**Open:** ₹{price.open:,.2f}
+**High:** ₹{price.high:,.2f}
+**Low:** ₹{price.low:,.2f}
+**Previous Close:** ₹{price.close:,.2f}
+
+**Day Change:** {indicator} ₹{price.change:+.2f} ({price.change_percent:+.2f}%)
+**Volume:** {price.volume:,} shares
+
+**Last Updated:** {updated}
+
+💡 **Live data from Groww API**
+"""
+
+_PORTFOLIO_HEADER_TMPL = """
+💼 **Portfolio Summary**
+
+**Total Portfolio Value:** ₹{portfolio.total_value:,.2f}
+**Total Invested:** ₹{portfolio.invested_value:,.2f}
+**Cash Balance:** ₹{portfolio.cash_balance:,.2f}
+
+**Holdings ({count} stocks):**
+"""
+
+_PORTFOLIO_HOLDING_TMPL = """
+• **{h.symbol}**
+  Quantity: {h.quantity} shares
+  Average Price: ₹{h.average_price:.2f}
+  Total Invested: ₹{invested:,.2f}
+"""
+
+_HOLDING_TMPL = """**{h.symbol}**
+• Quantity: {h.quantity} shares
+• Average Price: ₹{h.average_price:.2f}
+• Current Price: ₹{h.current_price:.2f}
+• Market Value: ₹{h.market_value:,.2f}
+• P&L: {indicator} ₹{h.pnl:,.2f} ({h.pnl_percent:+.2f}%)
+
+"""
+
+# Display icons for order and alert statuses
+_STATUS_ICON = {
+    "PENDING": "⏳",
+    "EXECUTED": "✅",
+    "CANCELLED": "❌",
+    "REJECTED": "🚫",
+    "PARTIAL": "🔄"
+}
+
+_ALERT_EMOJI = {
+    "active": "🟢",
+    "triggered": "🔴",
+    "cancelled": "❌",
+    "expired": "⏰"
+}
+
+# Alert status filter values, resolved without going through the enum constructor
+_ALERT_STATUS_MAP = {s.value: s for s in AlertStatus}
+
+
+@lru_cache(maxsize=None)
+def _alert_type_labels(alert_type: str) -> Tuple[str, str]:
+    """Get the display name and threshold suffix for an alert type value."""
+    suffix = '%' if 'percentage' in alert_type else (
+        '₹' if 'price' in alert_type else '')
+    return alert_type.replace('_', ' ').title(), suffix
+
+
+_PORTFOLIO_FOOTER = """
+
+📝 **Note:** Real-time P&L calculations are limited by API permissions.
+This shows your holdings with purchase prices. For current market prices,
+use a trading platform or market data service.
+"""
+
+
+# Older SDK versions don't accept a message with progress notifications
+_PROGRESS_ACCEPTS_MESSAGE = "message" in inspect.signature(
+    ServerSession.send_progress_notification).parameters
+
+
+async def _report_progress(progress: float, message: str) -> None:
+    """Send an MCP progress notification if the caller asked for one."""
+    try:
+        ctx = server.request_context
+    except LookupError:
+        return  # Not inside a request
+
+    token = ctx.meta.progressToken if ctx.meta else None
+    if token is None:
+        return
+
+    kwargs = {"message": message} if _PROGRESS_ACCEPTS_MESSAGE else {}
+    try:
+        await ctx.session.send_progress_notification(
+            token, progress, total=1.0, **kwargs)
+    except Exception as e:
+        logger.debug(f"Could not send progress notification: {e}")
+
+
+async def handle_buy_stock(arguments: dict) -> list[types.TextContent]:
+    """Handle buy stock command."""
+    return await _handle_order(OrderSide.BUY, arguments)
 
 
 async def handle_sell_stock(arguments: dict) -> list[types.TextContent]:
     """Handle sell stock command."""
+    return await _handle_order(OrderSide.SELL, arguments)
+
+
+async def _handle_order(side: OrderSide, arguments: dict) -> list[types.TextContent]:
+    """Handle a buy or sell stock command."""
+    action = "buy" if side is OrderSide.BUY else "sell"
+    other_action = "sell" if side is OrderSide.BUY else "buy"
+
     command = arguments.get("command", "")
     confirm = arguments.get("confirm", False)
 
@@ -592,10 +780,10 @@ async def handle_sell_stock(arguments: dict) -> list[types.TextContent]:
                 f"• {s}" for s in suggestions)
         )]
 
-    if parsed_command.action != "sell":
+    if parsed_command.action != action:
         return [types.TextContent(
             type="text",
-            text="❌ This is not a sell command. Use the buy_stock tool for buying."
+            text=f"❌ This is not a {action} command. Use the {other_action}_stock tool for {other_action}ing."
         )]
 
     # Override with explicit parameters if provided
@@ -627,74 +815,67 @@ async def handle_sell_stock(arguments: dict) -> list[types.TextContent]:
 
     # Show order preview
     if not confirm:
-        preview = f"""
-📋 **Sell Order Preview**
-
-**Stock:** {symbol}
-**Action:** SELL
-**Quantity:** {quantity if quantity else 'TBD (based on amount)'}
-**Amount:** {f'₹{amount:,.2f}' if amount else 'TBD (based on quantity)'}
-**Order Type:** {order_type.value}
-**Price:** {f'₹{price:,.2f}' if price else 'Market Price'}
-
-⚠️ **This is a preview only. To execute this order, add `"confirm": true` to your request.**
-
-💡 **Example:**
-"""
+        preview = _ORDER_PREVIEW_TMPL.format(
+            title=action.title(),
+            symbol=symbol,
+            side=side.value,
+            quantity=quantity if quantity else 'TBD (based on amount)',
+            amount=f'₹{amount:,.2f}' if amount else 'TBD (based on quantity)',
+            order_type=order_type.value,
+            price=f'₹{price:,.2f}' if price else 'Market Price'
+        )
         preview += '```json\n{"command": "' + \
             command + '", "confirm": true}\n```'
         return [types.TextContent(type="text", text=preview)]
 
     # Execute the order
-    async with GrowwClient() as client:
-        try:
-            # If amount is specified, get current price to calculate quantity
-            if amount and not quantity:
-                stock_price = await client.get_stock_price(symbol)
-                quantity = int(amount / stock_price.ltp)
-                if quantity == 0:
-                    return [types.TextContent(
-                        type="text",
-                        text=f"❌ Amount ₹{amount:,.2f} is too small to sell even 1 share of {symbol} (current price: ₹{stock_price.ltp:,.2f})"
-                    )]
-
-            order_request = OrderRequest(
-                symbol=symbol,
-                quantity=quantity,
-                order_type=order_type,
-                order_side=OrderSide.SELL,
-                product_type=ProductType.CNC,
-                price=price,
-                validity="DAY"
-            )
+    client = await get_client()
+    try:
+        # If amount is specified, get current price to calculate quantity
+        if amount and not quantity:
+            await _report_progress(0.3, "Fetching current price...")
+            stock_price = await client.get_stock_price(symbol)
+            quantity = int(amount / stock_price.ltp)
+            if quantity == 0:
+                return [types.TextContent(
+                    type="text",
+                    text=f"❌ Amount ₹{amount:,.2f} is too small to {action} even 1 share of {symbol} (current price: ₹{stock_price.ltp:,.2f})"
+                )]
 
-            order = await client.place_order(order_request)
+        order_request = OrderRequest(
+            symbol=symbol,
+            quantity=quantity,
+            order_type=order_type,
+            order_side=side,
+            product_type=ProductType.CNC,
+            price=price,
+            validity="DAY"
+        )
 
-            success_msg = f"""
-✅ **Sell Order Placed Successfully**
+        await _report_progress(0.8, f"Placing {action} order...")
+        order = await client.place_order(order_request)
 
-**Order ID:** {order.order_id}
-**Stock:** {order.symbol}
-**Quantity:** {order.quantity} shares
-**Order Type:** {order.order_type.value}
-**Status:** {order.status.value}
-**Order Time:** {order.order_time.strftime('%Y-%m-%d %H:%M:%S')}
-"""
-            if order.price:
-                success_msg += f"**Price:** ₹{order.price:,.2f}\n"
+        # A new order changes both the order book and (once filled) holdings
+        _fetch_orders.cache_clear()
+        _fetch_holdings.cache_clear()
 
-            return [types.TextContent(type="text", text=success_msg)]
+        success_msg = _ORDER_SUCCESS_TMPL.format(
+            title=action.title(),
+            order=order,
+            order_time=order.order_time.strftime('%Y-%m-%d %H:%M:%S')
+        )
+        if order.price:
+            success_msg += f"**Price:** ₹{order.price:,.2f}\n"
 
-        except GrowwAPIError as e:
-            return [types.TextContent(
-                type="text",
-                text=f"❌ Failed to place sell order: {str(e)}"
-            )]
+        return [types.TextContent(type="text", text=success_msg)]
+
+    except GrowwAPIError as e:
+        return _groww_error_response(e, f"place {action} order")
 
 
 async def handle_get_stock_price(arguments: dict) -> list[types.TextContent]:
     """Handle get stock price."""
-    symbol = arguments.get("symbol", "").upper()
+    symbol = normalize_symbol(arguments.get("symbol", ""))
 
     if not symbol:
         return [types.TextContent(
@@ -702,54 +883,44 @@ async def handle_get_stock_price(arguments: dict) -> list[types.TextContent]:
             text="❌ Stock symbol is required"
         )]
 
-    async with GrowwClient() as client:
-        try:
-            # Get live stock price data
-            stock_price = await client.get_stock_price(symbol)
-
-            # Format the price information
-            price_change_indicator = "📈" if stock_price.change >= 0 else "📉"
-
-            stock_msg = f"""
-📊 **{symbol} - Live Stock Price**
-
-**Current Price (LTP):** ₹{stock_price.ltp:,.2f}
-**Open:** ₹{stock_price.open:,.2f}
-**High:** ₹{stock_price.high:,.2f}
-**Low:** ₹{stock_price.low:,.2f}
-**Previous Close:** ₹{stock_price.close:,.2f}
-
-**Day Change:** {price_change_indicator} ₹{stock_price.change:+.2f} ({stock_price.change_percent:+.2f}%)
-**Volume:** {stock_price.volume:,} shares
+    client = await get_client()
+    try:
+        # Get live stock price data
+        stock_price = await client.get_stock_price(symbol)
 
-**Last Updated:** {stock_price.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
+        # Format the price information
+        price_change_indicator = "📈" if stock_price.change >= 0 else "📉"
 
-💡 **Live data from Groww API**
-"""
+        stock_msg = _STOCK_PRICE_TMPL.format(
+            symbol=symbol,
+            price=stock_price,
+            indicator=price_change_indicator,
+            updated=stock_price.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        )
 
-            return [types.TextContent(type="text", text=stock_msg)]
+        return [types.TextContent(type="text", text=stock_msg)]
 
-        except GrowwAPIError as e:
-            # If direct price fetch fails, try to get basic stock info
-            try:
-                stock_results = await client.search_stocks(symbol)
-                if stock_results:
-                    stock = stock_results[0]
-                    fallback_msg = f"""
+    except GrowwAPIError as e:
+        # If direct price fetch fails, try to get basic stock info
+        try:
+            stock_results = await client.search_stocks(symbol)
+            if stock_results:
+                stock = stock_results[0]
+                parts = [f"""
 📊 **{symbol} Stock Information**
 
 **Company:** {stock.name}
 **Exchange:** {stock.exchange}
 **Trading Symbol:** {stock.symbol}
-"""
-                    if stock.isin:
-                        fallback_msg += f"**ISIN:** {stock.isin}\n"
-                    if stock.sector:
-                        fallback_msg += f"**Sector:** {stock.sector}\n"
-                    if stock.industry:
-                        fallback_msg += f"**Industry:** {stock.industry}\n"
+"""]
+                if stock.isin:
+                    parts.append(f"**ISIN:** {stock.isin}\n")
+                if stock.sector:
+                    parts.append(f"**Sector:** {stock.sector}\n")
+                if stock.industry:
+                    parts.append(f"**Industry:** {stock.industry}\n")
 
-                    fallback_msg += f"""
+                parts.append(f"""
 
 ⚠️ **Live price data temporarily unavailable**
 Error: {str(e)}
@@ -757,167 +928,71 @@ Error: {str(e)}
 💡 **To get live prices, try:**
 • Using your Groww trading app
 • Checking financial websites like NSE, BSE, or Moneycontrol
-"""
-                    return [types.TextContent(type="text", text=fallback_msg)]
-                else:
-                    return [types.TextContent(
-                        type="text",
-                        text=f"❌ Stock symbol '{symbol}' not found. Please check the symbol and try again."
-                    )]
-            except Exception as fallback_error:
+""")
+                return [types.TextContent(type="text", text="".join(parts))]
+            else:
                 return [types.TextContent(
                     type="text",
-                    text=f"❌ Failed to get information for {symbol}: {str(e)}"
+                    text=f"❌ Stock symbol '{symbol}' not found. Please check the symbol and try again."
                 )]
+        except Exception as fallback_error:
+            return [types.TextContent(
+                type="text",
+                text=f"❌ Failed to get information for {symbol}: {str(e)}"
+            )]
 
 
 async def handle_get_portfolio(arguments: dict) -> list[types.TextContent]:
     """Handle get portfolio."""
-    async with GrowwClient() as client:
-        try:
-            portfolio = await client.get_portfolio()
-
-            portfolio_msg = f"""
-💼 **Portfolio Summary**
-
-**Total Portfolio Value:** ₹{portfolio.total_value:,.2f}
-**Total Invested:** ₹{portfolio.invested_value:,.2f}
-**Cash Balance:** ₹{portfolio.cash_balance:,.2f}
-
-**Holdings ({len(portfolio.holdings)} stocks):**
-"""
+    client = await get_client()
+    try:
+        # Built from the cached holdings, so it shares their 30 second reuse window
+        portfolio = await client.get_portfolio(await _fetch_holdings())
 
-            for holding in portfolio.holdings:
-                invested_value = holding.quantity * holding.average_price
-                portfolio_msg += f"""
-• **{holding.symbol}**
-  Quantity: {holding.quantity} shares
-  Average Price: ₹{holding.average_price:.2f}
-  Total Invested: ₹{invested_value:,.2f}
-"""
+        parts = [_PORTFOLIO_HEADER_TMPL.format(
+            portfolio=portfolio, count=len(portfolio.holdings))]
 
-            portfolio_msg += f"""
+        row = _PORTFOLIO_HOLDING_TMPL.format
+        parts.extend(
+            row(h=holding, invested=holding.quantity * holding.average_price)
+            for holding in portfolio.holdings
+        )
 
-📝 **Note:** Real-time P&L calculations are limited by API permissions.
-This shows your holdings with purchase prices. For current market prices,
-use a trading platform or market data service.
-"""
+        parts.append(_PORTFOLIO_FOOTER)
 
-            return [types.TextContent(type="text", text=portfolio_msg)]
+        return _chunked_text(parts)
 
-        except GrowwAPIError as e:
-            return [types.TextContent(
-                type="text",
-                text=f"❌ Failed to get portfolio: {str(e)}"
-            )]
+    except GrowwAPIError as e:
+        return _groww_error_response(e, "get portfolio")
 
 
 async def handle_get_holdings(arguments: dict) -> list[types.TextContent]:
     """Handle get holdings."""
-    async with GrowwClient() as client:
-        try:
-            holdings = await client.get_holdings()
-
-            if not holdings:
-                return [types.TextContent(
-                    type="text",
-                    text="📭 **No Holdings Found**\n\nYou don't have any stock holdings currently."
-                )]
-
-            holdings_msg = f"📊 **Current Holdings ({len(holdings)} stocks)**\n\n"
-
-            for holding in holdings:
-                pnl_indicator = "📈" if holding.pnl >= 0 else "📉"
-                holdings_msg += f"""**{holding.symbol}**
-• Quantity: {holding.quantity} shares
-• Average Price: ₹{holding.average_price:.2f}
-• Current Price: ₹{holding.current_price:.2f}
-• Market Value: ₹{holding.market_value:,.2f}
-• P&L: {pnl_indicator} ₹{holding.pnl:,.2f} ({holding.pnl_percent:+.2f}%)
-
-"""
-
-            return [types.TextContent(type="text", text=holdings_msg)]
+    try:
+        holdings = await _fetch_holdings()
 
-        except GrowwAPIError as e:
+        if not holdings:
             return [types.TextContent(
                 type="text",
-                text=f"❌ Failed to get holdings: {str(e)}"
+                text="📭 **No Holdings Found**\n\nYou don't have any stock holdings currently."
             )]
 
+        parts = [f"📊 **Current Holdings ({len(holdings)} stocks)**\n\n"]
 
-async def handle_get_orders(arguments: dict) -> list[types.TextContent]:
-    """Handle get orders."""
-    status_filter = arguments.get("status", "ALL")
-    start_date = arguments.get("start_date")
-    end_date = arguments.get("end_date")
+        row = _HOLDING_TMPL.format
+        parts.extend(
+            row(h=holding, indicator="📈" if holding.pnl >= 0 else "📉")
+            for holding in holdings
+        )
 
-    # Parse and validate dates if provided
-    start_date_obj = None
-    end_date_obj = None
+        return _chunked_text(parts)
 
-    try:
-        if start_date:
-            start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-        if end_date:
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
+    except GrowwAPIError as e:
+        return _groww_error_response(e, "get holdings")
 
-        # Validate date range
-        if start_date_obj and end_date_obj and start_date_obj > end_date_obj:
-            return [types.TextContent(
-                type="text",
-                text="❌ **Invalid Date Range**\n\nStart date must be before or equal to end date."
-            )]
-    except ValueError as e:
-        return [types.TextContent(
-            type="text",
-            text=f"❌ **Invalid Date Format**\n\nPlease use YYYY-MM-DD format for dates. Error: {str(e)}"
-        )]
 
-    async with GrowwClient() as client:
-        try:
-            orders = await client.get_orders()
-            original_count = len(orders)
-
-            # Filter orders by status
-            if status_filter != "ALL":
-                orders = [
-                    order for order in orders if order.status.value == status_filter]
-
-            # Filter orders by date range
-            if start_date_obj or end_date_obj:
-                filtered_orders = []
-                for order in orders:
-                    order_date = order.order_time.date()
-
-                    # Check if order falls within the date range
-                    if start_date_obj and order_date < start_date_obj:
-                        continue
-                    if end_date_obj and order_date > end_date_obj:
-                        continue
-
-                    filtered_orders.append(order)
-
-                orders = filtered_orders
-
-            if not orders:
-                message = f"📭 **No Orders Found**\n\n"
-                if start_date or end_date:
-                    date_range = ""
-                    if start_date and end_date:
-                        date_range = f"between {start_date} and {end_date}"
-                    elif start_date:
-                        date_range = f"from {start_date} onwards"
-                    elif end_date:
-                        date_range = f"up to {end_date}"
-
-                    message += f"No orders found {date_range}"
-                    if status_filter != "ALL":
-                        message += f" with status: {status_filter}"
-                    message += f"\n\nTotal orders fetched: {original_count}"
-                else:
-                    if original_count == 0:
-                        message += """📊 **Understanding Groww Order Data**
+# Explanation shown when the Groww API returns no orders at all
+_UNDERSTANDING_ORDER_DATA = """📊 **Understanding Groww Order Data**
 
 The Groww API has specific limitations:
 • `get_order_list` only shows **orders placed today** (current trading day)
@@ -934,126 +1009,176 @@ The Groww API has specific limitations:
 • Each holding shows the average price you paid (historical trade data)
 • Positions data shows individual buy/sell transactions
 
-💡 **To see your trading history:** Use `get_holdings` or `get_portfolio` commands."""
-                    else:
-                        message += f"No orders found with status: {status_filter}"
+💡 **To see your trading history:** Use `get_holdings` or `get_portfolio` commands."""
+
+
+def _int_arg(arguments: dict, name: str, default: int) -> int:
+    """Read a whole-number tool argument, raising ValueError for anything else."""
+    value = arguments.get(name)
+    if value is None:
+        return default
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"{name} must be a whole number")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a whole number") from None
+
+
+async def handle_get_orders(arguments: dict) -> list[types.TextContent]:
+    """Handle get orders."""
+    status_filter = arguments.get("status", "ALL")
+    start_date = arguments.get("start_date")
+    end_date = arguments.get("end_date")
+
+    try:
+        page = max(_int_arg(arguments, "page", 1), 1)
+        page_size = min(max(_int_arg(arguments, "page_size", 50), 1), 200)
+    except ValueError as e:
+        return [types.TextContent(
+            type="text",
+            text=f"❌ **Invalid Pagination**\n\n{e}. Use e.g. page 2 and page_size 50."
+        )]
+
+    # Parse and validate dates if provided
+    start_date_obj = None
+    end_date_obj = None
+
+    try:
+        if start_date:
+            start_date_obj = date.fromisoformat(start_date)
+        if end_date:
+            end_date_obj = date.fromisoformat(end_date)
 
-                return [types.TextContent(type="text", text=message)]
+        # Validate date range
+        if start_date_obj and end_date_obj and start_date_obj > end_date_obj:
+            return [types.TextContent(
+                type="text",
+                text="❌ **Invalid Date Range**\n\nStart date must be before or equal to end date."
+            )]
+    except ValueError as e:
+        return [types.TextContent(
+            type="text",
+            text=f"❌ **Invalid Date Format**\n\nPlease use YYYY-MM-DD format for dates. Error: {str(e)}"
+        )]
 
-            # Create summary header with explanation
-            orders_msg = f"📋 **Orders Found ({len(orders)} orders"
+    try:
+        orders = await _fetch_orders()
+        original_count = len(orders)
+
+        # Sort once (oldest first) so the date range can be found by bisection
+        orders = sorted(orders, key=attrgetter('order_time'))
+
+        # Filter orders by date range
+        if start_date_obj or end_date_obj:
+            def order_date(order):
+                return order.order_time.date()
+
+            lo = bisect_left(orders, start_date_obj,
+                             key=order_date) if start_date_obj else 0
+            hi = bisect_right(orders, end_date_obj,
+                              key=order_date) if end_date_obj else len(orders)
+            orders = orders[lo:hi]
+
+        # Filter by status and split by data source in a single pass
+        kept = []
+        historical_count = 0
+        for order in orders:
+            if status_filter != "ALL" and order.status.value != status_filter:
+                continue
+            kept.append(order)
+            if order.order_id.startswith("HIST-"):
+                historical_count += 1
+        orders = kept
+        current_day_count = len(orders) - historical_count
+
+        if not orders:
+            message = f"📭 **No Orders Found**\n\n"
             if start_date or end_date:
                 date_range = ""
                 if start_date and end_date:
                     date_range = f"between {start_date} and {end_date}"
                 elif start_date:
-                    date_range = f"from {start_date}"
+                    date_range = f"from {start_date} onwards"
                 elif end_date:
                     date_range = f"up to {end_date}"
-                orders_msg += f" {date_range}"
-            if status_filter != "ALL":
-                orders_msg += f", status: {status_filter}"
-            orders_msg += f")**\n\n"
-
-            # Count order types
-            current_day_orders = [
-                o for o in orders if not o.order_id.startswith("HIST-")]
-            historical_orders = [
-                o for o in orders if o.order_id.startswith("HIST-")]
-
-            if historical_orders:
-                orders_msg += f"""📊 **Order Data Sources:**
-• **Current Day Orders:** {len(current_day_orders)} (from Groww API)
-• **Historical Trades:** {len(historical_orders)} (reconstructed from holdings/positions)
+
+                message += f"No orders found {date_range}"
+                if status_filter != "ALL":
+                    message += f" with status: {status_filter}"
+                message += f"\n\nTotal orders fetched: {original_count}"
+            else:
+                if original_count == 0:
+                    message += _UNDERSTANDING_ORDER_DATA
+                else:
+                    message += f"No orders found with status: {status_filter}"
+
+            return [types.TextContent(type="text", text=message)]
+
+        # Create summary header with explanation
+        orders_msg = f"📋 **Orders Found ({len(orders)} orders"
+        if start_date or end_date:
+            date_range = ""
+            if start_date and end_date:
+                date_range = f"between {start_date} and {end_date}"
+            elif start_date:
+                date_range = f"from {start_date}"
+            elif end_date:
+                date_range = f"up to {end_date}"
+            orders_msg += f" {date_range}"
+        if status_filter != "ALL":
+            orders_msg += f", status: {status_filter}"
+        orders_msg += f")**\n\n"
+        parts = [orders_msg]
+
+        if historical_count:
+            parts.append(f"""📊 **Order Data Sources:**
+• **Current Day Orders:** {current_day_count} (from Groww API)
+• **Historical Trades:** {historical_count} (reconstructed from holdings/positions)
 
 💡 **Note:** Groww's `get_order_list` API only shows current day orders. Historical trades are reconstructed from your portfolio data.
 
-"""
+""")
 
-            if original_count > len(orders):
-                orders_msg += f"*Showing {len(orders)} of {original_count} total orders*\n\n"
+        if original_count > len(orders):
+            parts.append(
+                f"*Showing {len(orders)} of {original_count} total orders*\n\n")
 
-            # Sort orders by date (newest first)
-            orders.sort(key=lambda x: x.order_time, reverse=True)
+        # Show newest orders first, one page at a time
+        orders.reverse()
+        total_pages = (len(orders) + page_size - 1) // page_size
+        page = min(page, total_pages)
 
-            for order in orders:
-                status_icon = {
-                    "PENDING": "⏳",
-                    "EXECUTED": "✅",
-                    "CANCELLED": "❌",
-                    "REJECTED": "🚫",
-                    "PARTIAL": "🔄"
-                }.get(order.status.value, "❓")
+        for order in orders[(page - 1) * page_size:page * page_size]:
+            status = order.status.value
+            status_icon = _STATUS_ICON.get(status, "❓")
 
-                orders_msg += f"""**{order.order_id}** {status_icon}
+            parts.append(f"""**{order.order_id}** {status_icon}
 • Stock: {order.symbol}
 • Action: {order.order_side.value}
 • Quantity: {order.quantity} shares
 • Type: {order.order_type.value}
-• Status: {order.status.value}
+• Status: {status}
 • Order Time: {order.order_time.strftime('%Y-%m-%d %H:%M:%S')}
-"""
-                if order.price:
-                    orders_msg += f"• Price: ₹{order.price:.2f}\n"
-                if order.average_price:
-                    orders_msg += f"• Avg Price: ₹{order.average_price:.2f}\n"
-
-                orders_msg += "\n"
-
-            return [types.TextContent(type="text", text=orders_msg)]
-
-        except GrowwAPIError as e:
-            error_message = str(e)
-
-            # Detect authentication issues
-            if "Authentication failed" in error_message or "expired or is invalid" in error_message:
-                return [types.TextContent(
-                    type="text",
-                    text=f"""🔐 **Authentication Error**
-
-❌ **Your Groww API token has expired or is invalid.**
-
-**What this means:**
-• Your API access token is no longer valid
-• You need to get a fresh token from Groww
-• This is a common issue as API tokens expire periodically
-
-**🔧 How to fix this:**
-
-1. **Get a new API token:**
-   • Log into your Groww account
-   • Go to the API/Developer section
-   • Generate a new access token
-
-2. **Update your environment:**
-   • Set the new token: `GROWW_ACCESS_TOKEN=your_new_token`
-   • Restart this MCP server
-
-3. **Test the connection:**
-   • Try fetching orders again after updating the token
-
-**💡 Pro tip:** API tokens typically expire every 30-90 days for security reasons.
-
-**Error details:** {error_message}"""
-                )]
-
-            # Other API errors
-            return [types.TextContent(
-                type="text",
-                text=f"""❌ **API Connection Error**
+""")
+            if order.price:
+                parts.append(f"• Price: ₹{order.price:.2f}\n")
+            if order.average_price:
+                parts.append(f"• Avg Price: ₹{order.average_price:.2f}\n")
 
-Failed to retrieve orders from Groww API.
+            parts.append("\n")
 
-**Error details:** {error_message}
+        if total_pages > 1:
+            parts.append(f"📄 **Page {page} of {total_pages}**")
+            if page < total_pages:
+                parts.append(
+                    f" - pass `\"page\": {page + 1}` to see more orders")
+            parts.append("\n")
 
-**Possible solutions:**
-• Check your internet connection
-• Verify your API token is valid
-• Try again in a few moments
-• Contact Groww support if the issue persists
+        return _chunked_text(parts)
 
-**Need help?** Use the diagnostic script: `python debug_orders.py`"""
-            )]
+    except GrowwAPIError as e:
+        return _groww_error_response(e, "retrieve orders", _ORDERS_API_ERROR_TMPL)
 
 
 async def handle_cancel_order(arguments: dict) -> list[types.TextContent]:
@@ -1073,27 +1198,25 @@ async def handle_cancel_order(arguments: dict) -> list[types.TextContent]:
             text=f"⚠️ **Order Cancellation Preview**\n\nYou are about to cancel order: {order_id}\n\nTo confirm, add `\"confirm\": true` to your request."
         )]
 
-    async with GrowwClient() as client:
-        try:
-            success = await client.cancel_order(order_id)
-
-            if success:
-                return [types.TextContent(
-                    type="text",
-                    text=f"✅ **Order Cancelled Successfully**\n\nOrder {order_id} has been cancelled."
-                )]
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text=f"❌ **Failed to Cancel Order**\n\nOrder {order_id} could not be cancelled. It may already be executed or doesn't exist."
-                )]
+    client = await get_client()
+    try:
+        success = await client.cancel_order(order_id)
+        _fetch_orders.cache_clear()
 
-        except GrowwAPIError as e:
+        if success:
+            return [types.TextContent(
+                type="text",
+                text=f"✅ **Order Cancelled Successfully**\n\nOrder {order_id} has been cancelled."
+            )]
+        else:
             return [types.TextContent(
                 type="text",
-                text=f"❌ Failed to cancel order {order_id}: {str(e)}"
+                text=f"❌ **Failed to Cancel Order**\n\nOrder {order_id} could not be cancelled. It may already be executed or doesn't exist."
             )]
 
+    except GrowwAPIError as e:
+        return _groww_error_response(e, f"cancel order {order_id}")
+
 
 async def handle_search_stocks(arguments: dict) -> list[types.TextContent]:
     """Handle search stocks."""
@@ -1105,48 +1228,44 @@ async def handle_search_stocks(arguments: dict) -> list[types.TextContent]:
             text="❌ Search query is required"
         )]
 
-    async with GrowwClient() as client:
-        try:
-            stocks = await client.search_stocks(query)
+    try:
+        stocks = await _cached_search(query.strip().lower())
 
-            if not stocks:
-                return [types.TextContent(
-                    type="text",
-                    text=f"❌ **No Results Found**\n\nNo stocks found for query: '{query}'"
-                )]
+        if not stocks:
+            return [types.TextContent(
+                type="text",
+                text=f"❌ **No Results Found**\n\nNo stocks found for query: '{query}'"
+            )]
 
-            search_msg = f"🔍 **Search Results for '{query}' ({len(stocks)} results)**\n\n"
+        search_msg = f"🔍 **Search Results for '{query}' ({len(stocks)} results)**\n\n"
 
-            for stock in stocks[:10]:  # Limit to top 10 results
-                search_msg += f"""**{stock.symbol}** - {stock.name}
+        for stock in stocks[:10]:  # Limit to top 10 results
+            search_msg += f"""**{stock.symbol}** - {stock.name}
 • Exchange: {stock.exchange}
 """
-                if stock.sector:
-                    search_msg += f"• Sector: {stock.sector}\n"
-                if stock.industry:
-                    search_msg += f"• Industry: {stock.industry}\n"
+            if stock.sector:
+                search_msg += f"• Sector: {stock.sector}\n"
+            if stock.industry:
+                search_msg += f"• Industry: {stock.industry}\n"
 
-                search_msg += "\n"
+            search_msg += "\n"
 
-            if len(stocks) > 10:
-                search_msg += f"... and {len(stocks) - 10} more results"
+        if len(stocks) > 10:
+            search_msg += f"... and {len(stocks) - 10} more results"
 
-            return [types.TextContent(type="text", text=search_msg)]
+        return [types.TextContent(type="text", text=search_msg)]
 
-        except GrowwAPIError as e:
-            return [types.TextContent(
-                type="text",
-                text=f"❌ Failed to search stocks: {str(e)}"
-            )]
+    except GrowwAPIError as e:
+        return _groww_error_response(e, "search stocks")
 
 
 async def handle_get_market_status(arguments: dict) -> list[types.TextContent]:
     """Handle get market status."""
-    async with GrowwClient() as client:
-        try:
-            market_status = await client.get_market_status()
+    client = await get_client()
+    try:
+        market_status = await client.get_market_status()
 
-            status_msg = f"""
+        status_msg = f"""
 🕐 **Market Status**
 
 **Current Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -1159,13 +1278,10 @@ async def handle_get_market_status(arguments: dict) -> list[types.TextContent]:
 **Next Session:** {market_status.get('next_session', 'N/A')}
 """
 
-            return [types.TextContent(type="text", text=status_msg)]
+        return [types.TextContent(type="text", text=status_msg)]
 
-        except GrowwAPIError as e:
-            return [types.TextContent(
-                type="text",
-                text=f"❌ Failed to get market status: {str(e)}"
-            )]
+    except GrowwAPIError as e:
+        return _groww_error_response(e, "get market status")
 
 
 async def handle_parse_trade_command(arguments: dict) -> list[types.TextContent]:
@@ -1207,6 +1323,74 @@ async def handle_parse_trade_command(arguments: dict) -> list[types.TextContent]
     return [types.TextContent(type="text", text=parse_msg)]
 
 
+# Static help shown when an alert command cannot be used (str.format templates)
+_ALERT_PARSE_ERROR_TMPL = """❌ **Alert Parsing Error**
+
+{error}
+
+💡 **{suggestion}**
+
+🤖 **For Advanced Users (LLM Integration):**
+You can also provide structured data in JSON format:
+```json
+{{
+  "stock_name": "RELIANCE",
+  "alert_type_hint": "percentage_increase",
+  "threshold_value": 5.0,
+  "original_command": "Set alert for Reliance when it goes up by 5%"
+}}
+```
+
+**Supported alert_type_hints:**
+• `percentage_increase` / `percentage_decrease`
+• `price_above` / `price_below`
+• `volume_above`
+
+**Example Commands:**
+• 'Set alert for RELIANCE if it goes up by 2%'
+• 'Alert me when TCS goes down by 5%'
+• 'Set alert for HDFC Bank if it goes above ₹1600'
+• 'Alert when Infosys goes below ₹1400'"""
+
+_STOCK_NOT_FOUND_TMPL = """❌ **Stock Not Found**
+
+{error}
+
+💡 **What happened:**
+• The system intelligently searched for your stock using multiple strategies
+• No matching stocks were found in the database
+• This could be due to an incorrect name or an unlisted stock
+
+🔍 **Suggestions:**
+• Try using the `search_stocks` tool first to explore available stocks
+• Check the spelling of the company name
+• Try using the stock's trading symbol (e.g., 'RELIANCE', 'TCS')
+• Try a shorter version of the name (e.g., 'Reliance' instead of 'Reliance Industries')
+
+**Example Commands:**
+• 'Set alert for Reliance if it goes up by 2%'
+• 'Alert me when TCS goes down by 5%'
+• 'Set alert for HDFC Bank if it goes above ₹1600'
+• 'Alert when Infosys goes below ₹1400'"""
+
+_STOCK_NAME_PARSE_ERROR_TMPL = """❌ **Could Not Parse Stock Name**
+
+{error}
+
+💡 **Examples of valid commands:**
+• 'Set alert for RELIANCE if it goes up by 2%'
+• 'Alert me when TCS goes down by 5%'
+• 'Set alert for Waaree Energies if it goes down by 3%'
+• 'Alert when State Bank of India goes above ₹500'
+• 'Set alert for HDFC Bank if it goes below ₹1500'
+
+🤖 **How it works:**
+• The system dynamically searches for ANY stock you mention
+• No hardcoded lists - works with all available stocks
+• Handles both company names and stock symbols
+• Automatically finds the best match"""
+
+
 async def handle_set_price_alert(arguments: dict) -> list[types.TextContent]:
     """Handle set price alert."""
     global alert_manager
@@ -1226,9 +1410,6 @@ async def handle_set_price_alert(arguments: dict) -> list[types.TextContent]:
         )]
 
     try:
-        # Import market utils for status
-        from .market_utils import get_market_status
-
         # Try to parse the natural language command (now async)
         parsed_alert = await alert_manager.parse_alert_command(command)
 
@@ -1236,33 +1417,11 @@ async def handle_set_price_alert(arguments: dict) -> list[types.TextContent]:
         if "error" in parsed_alert:
             return [types.TextContent(
                 type="text",
-                text=f"""❌ **Alert Parsing Error**
-
-{parsed_alert['error']}
-
-💡 **{parsed_alert.get('suggestion', 'Please try again with a clearer command')}**
-
-🤖 **For Advanced Users (LLM Integration):**
-You can also provide structured data in JSON format:
-```json
-{{
-  "stock_name": "RELIANCE",
-  "alert_type_hint": "percentage_increase",
-  "threshold_value": 5.0,
-  "original_command": "Set alert for Reliance when it goes up by 5%"
-}}
-```
-
-**Supported alert_type_hints:**
-• `percentage_increase` / `percentage_decrease`
-• `price_above` / `price_below`
-• `volume_above`
-
-**Example Commands:**
-• 'Set alert for RELIANCE if it goes up by 2%'
-• 'Alert me when TCS goes down by 5%'
-• 'Set alert for HDFC Bank if it goes above ₹1600'
-• 'Alert when Infosys goes below ₹1400'"""
+                text=_ALERT_PARSE_ERROR_TMPL.format(
+                    error=parsed_alert['error'],
+                    suggestion=parsed_alert.get(
+                        'suggestion', 'Please try again with a clearer command')
+                )
             )]
 
         # Create the alert (this will validate the symbol)
@@ -1307,46 +1466,12 @@ You can also provide structured data in JSON format:
         if "Could not find any stock matching" in error_msg:
             return [types.TextContent(
                 type="text",
-                text=f"""❌ **Stock Not Found**
-
-{error_msg}
-
-💡 **What happened:**
-• The system intelligently searched for your stock using multiple strategies
-• No matching stocks were found in the database
-• This could be due to an incorrect name or an unlisted stock
-
-🔍 **Suggestions:**
-• Try using the `search_stocks` tool first to explore available stocks
-• Check the spelling of the company name
-• Try using the stock's trading symbol (e.g., 'RELIANCE', 'TCS')
-• Try a shorter version of the name (e.g., 'Reliance' instead of 'Reliance Industries')
-
-**Example Commands:**
-• 'Set alert for Reliance if it goes up by 2%'
-• 'Alert me when TCS goes down by 5%'
-• 'Set alert for HDFC Bank if it goes above ₹1600'
-• 'Alert when Infosys goes below ₹1400'"""
+                text=_STOCK_NOT_FOUND_TMPL.format(error=error_msg)
             )]
         elif "Could not identify any potential stock name" in error_msg:
             return [types.TextContent(
                 type="text",
-                text=f"""❌ **Could Not Parse Stock Name**
-
-{error_msg}
-
-💡 **Examples of valid commands:**
-• 'Set alert for RELIANCE if it goes up by 2%'
-• 'Alert me when TCS goes down by 5%'
-• 'Set alert for Waaree Energies if it goes down by 3%'
-• 'Alert when State Bank of India goes above ₹500'
-• 'Set alert for HDFC Bank if it goes below ₹1500'
-
-🤖 **How it works:**
-• The system dynamically searches for ANY stock you mention
-• No hardcoded lists - works with all available stocks
-• Handles both company names and stock symbols
-• Automatically finds the best match"""
+                text=_STOCK_NAME_PARSE_ERROR_TMPL.format(error=error_msg)
             )]
         else:
             return [types.TextContent(
@@ -1373,7 +1498,14 @@ async def handle_list_alerts(arguments: dict) -> list[types.TextContent]:
 
     symbol = arguments.get("symbol")
     status = arguments.get("status")
-    status_filter = AlertStatus(status) if status else None
+    status_filter = None
+    if status:
+        status_filter = _ALERT_STATUS_MAP.get(status)
+        if status_filter is None:
+            return [types.TextContent(
+                type="text",
+                text=f"❌ **Invalid Status**\n\nUnknown alert status '{status}'. Use one of: {', '.join(_ALERT_STATUS_MAP)}."
+            )]
 
     try:
         alerts = alert_manager.get_alerts(symbol=symbol, status=status_filter)
@@ -1390,31 +1522,27 @@ async def handle_list_alerts(arguments: dict) -> list[types.TextContent]:
                 text=f"📭 **No Alerts Found**\n\nYou don't have any alerts{filter_text}."
             )]
 
-        alerts_msg = f"📋 **Price Alerts ({len(alerts)} alerts)**\n\n"
+        parts = [f"📋 **Price Alerts ({len(alerts)} alerts)**\n\n"]
 
         for alert in alerts:
-            status_emoji = {
-                "active": "🟢",
-                "triggered": "🔴",
-                "cancelled": "❌",
-                "expired": "⏰"
-            }.get(alert.status.value, "❓")
+            alert_status = alert.status.value
+            status_emoji = _ALERT_EMOJI.get(alert_status, "❓")
+            alert_type_text, threshold_suffix = _alert_type_labels(
+                alert.alert_type.value)
 
-            alert_type_text = alert.alert_type.value.replace('_', ' ').title()
-
-            alerts_msg += f"""**{status_emoji} {alert.id[:8]}...** 
+            parts.append(f"""**{status_emoji} {alert.id[:8]}...** 
 • **Stock:** {alert.symbol}
 • **Type:** {alert_type_text}
-• **Threshold:** {alert.threshold}{'%' if 'percentage' in alert.alert_type.value else ('₹' if 'price' in alert.alert_type.value else '')}
+• **Threshold:** {alert.threshold}{threshold_suffix}
 • **Base Price:** {f'₹{alert.base_price:.2f}' if alert.base_price is not None else 'N/A'}
 • **Current Price:** {f'₹{alert.current_price:.2f}' if alert.current_price is not None else 'N/A'}
-• **Status:** {alert.status.value.title()}
+• **Status:** {alert_status.title()}
 • **Created:** {alert.created_at.strftime('%Y-%m-%d %H:%M:%S')}
 {f'• **Triggered:** {alert.triggered_at.strftime("%Y-%m-%d %H:%M:%S")}' if alert.triggered_at else ''}
 
-"""
+""")
 
-        return [types.TextContent(type="text", text=alerts_msg)]
+        return _chunked_text(parts)
 
     except Exception as e:
         logger.error(f"Error listing alerts: {e}")
@@ -1468,12 +1596,6 @@ You don't have any alerts to remove.
 """
                 )]
 
-            # Find similar IDs for suggestions
-            similar_alerts = []
-            for alert in all_alerts:
-                if alert_id.lower() in alert.id.lower() or alert.id.startswith(alert_id):
-                    similar_alerts.append(alert)
-
             error_msg = f"""❌ **Alert Not Found**
 
 Could not find alert with ID: `{alert_id}`
@@ -1517,9 +1639,6 @@ async def handle_check_alerts(arguments: dict) -> list[types.TextContent]:
         )]
 
     try:
-        # Import market utils for status check
-        from .market_utils import get_market_status, should_monitor_alerts
-
         market_status = get_market_status()
 
         # Show market status first
@@ -1612,30 +1731,8 @@ async def handle_alert_status(arguments: dict) -> list[types.TextContent]:
         )]
 
 
-async def handle_configure_email(arguments: dict) -> list[types.TextContent]:
-    """Handle configure email."""
-    try:
-        from .email_config import email_config_manager, EmailConfigManager
-
-        # Get provider for preset configurations
-        provider = arguments.get("provider")
-
-        if provider == "gmail":
-            username = arguments.get("username")
-            password = arguments.get("password")
-            to_email = arguments.get("to_email")
-            to_emails = arguments.get("to_emails", [])
-
-            # Handle both single email and multiple emails
-            if to_email and not to_emails:
-                to_emails = [to_email]
-            elif not to_emails:
-                to_emails = []
-
-            if not all([username, password]) or not to_emails:
-                return [types.TextContent(
-                    type="text",
-                    text="""❌ **Gmail Configuration Error**
+# Setup help shown when a provider is missing required email settings
+_GMAIL_HELP_MSG = """❌ **Gmail Configuration Error**
 
 For Gmail setup, please provide:
 • **username**: Your Gmail address
@@ -1670,30 +1767,8 @@ Multiple recipients:
   "to_emails": ["email1@gmail.com", "email2@gmail.com", "email3@gmail.com"]
 }
 ```"""
-                )]
-
-            config = EmailConfigManager.get_gmail_config(
-                # Use first email for compatibility
-                username, password, to_emails[0])
-            # Override with multiple emails
-            config.to_emails = to_emails
-
-        elif provider == "outlook":
-            username = arguments.get("username")
-            password = arguments.get("password")
-            to_email = arguments.get("to_email")
-            to_emails = arguments.get("to_emails", [])
-
-            # Handle both single email and multiple emails
-            if to_email and not to_emails:
-                to_emails = [to_email]
-            elif not to_emails:
-                to_emails = []
 
-            if not all([username, password]) or not to_emails:
-                return [types.TextContent(
-                    type="text",
-                    text="""❌ **Outlook Configuration Error**
+_OUTLOOK_HELP_MSG = """❌ **Outlook Configuration Error**
 
 For Outlook setup, please provide:
 • **username**: Your Outlook/Hotmail address
@@ -1720,36 +1795,9 @@ Multiple recipients:
   "password": "your-password",
   "to_emails": ["email1@outlook.com", "email2@gmail.com"]
 }
-```"""
-                )]
-
-            config = EmailConfigManager.get_outlook_config(
-                # Use first email for compatibility
-                username, password, to_emails[0])
-            # Override with multiple emails
-            config.to_emails = to_emails
-
-        else:
-            # Custom configuration
-            smtp_server = arguments.get("smtp_server")
-            smtp_port = arguments.get("smtp_port", 587)
-            username = arguments.get("username")
-            password = arguments.get("password")
-            from_email = arguments.get("from_email")
-            to_email = arguments.get("to_email")
-            to_emails = arguments.get("to_emails", [])
-            use_tls = arguments.get("use_tls", True)
-
-            # Handle both single email and multiple emails
-            if to_email and not to_emails:
-                to_emails = [to_email]
-            elif not to_emails:
-                to_emails = []
-
-            if not all([smtp_server, username, password, from_email]) or not to_emails:
-                return [types.TextContent(
-                    type="text",
-                    text="""❌ **Custom Email Configuration Error**
+```"""
+
+_CUSTOM_EMAIL_HELP_MSG = """❌ **Custom Email Configuration Error**
 
 Required fields:
 • **smtp_server**: SMTP server address
@@ -1789,43 +1837,252 @@ Multiple recipients:
   "use_tls": true
 }
 ```"""
-                )]
 
-            from .email_config import EmailConfig
+
+# Fixed email tool replies, built once and returned as-is by the handlers
+_GMAIL_HELP_REPLY = [types.TextContent(type="text", text=_GMAIL_HELP_MSG)]
+
+_OUTLOOK_HELP_REPLY = [types.TextContent(type="text", text=_OUTLOOK_HELP_MSG)]
+
+_CUSTOM_EMAIL_HELP_REPLY = [types.TextContent(type="text", text=_CUSTOM_EMAIL_HELP_MSG)]
+
+_INVALID_EMAIL_CONFIG_REPLY = [types.TextContent(
+    type="text",
+    text="❌ **Invalid Email Configuration**\n\nPlease check that all email fields are properly formatted and SMTP port is valid."
+)]
+
+_EMAIL_SAVE_FAILED_REPLY = [types.TextContent(
+    type="text",
+    text="❌ **Failed to save email configuration**. Please check the error logs."
+)]
+
+_EMAIL_NOT_CONFIGURED_REPLY = [types.TextContent(
+    type="text",
+    text="""❌ **Email Not Configured**
+
+Please configure your email settings first using the `configure_email` tool.
+
+💡 **Quick Setup:**
+```json
+{
+  "provider": "gmail",
+  "username": "your-email@gmail.com",
+  "password": "your-app-password",
+  "to_email": "your-email@gmail.com"
+}
+```"""
+)]
+
+_SMTP_CONNECTION_FAILED_REPLY = [types.TextContent(
+    type="text",
+    text="""❌ **SMTP Connection Failed**
+
+Unable to connect to the email server. Please check:
+• SMTP server address and port
+• Username and password
+• Internet connectivity
+• Firewall settings
+
+💡 **Common Issues:**
+• Gmail: Make sure you're using an App Password, not your regular password
+• Outlook: Verify your account credentials
+• Corporate email: Check if SMTP is allowed"""
+)]
+
+_TEST_EMAIL_FAILED_REPLY = [types.TextContent(
+    type="text",
+    text="""❌ **Test Email Failed**
+
+The email configuration appears correct, but sending failed. Please check:
+• Email provider settings
+• Rate limiting
+• Account restrictions
+
+💡 Try the test again in a few minutes."""
+)]
+
+_EMAIL_STATUS_NOT_CONFIGURED_REPLY = [types.TextContent(
+    type="text",
+    text="""📧 **Email Status: Not Configured**
+
+Email notifications are not set up yet.
+
+🚀 **Quick Setup:**
+```json
+{
+  "provider": "gmail",
+  "username": "your-email@gmail.com",
+  "password": "your-app-password",
+  "to_email": "your-email@gmail.com"
+}
+```
+
+💡 **Available Providers:**
+• `gmail` - Easy setup with App Password
+• `outlook` - Outlook/Hotmail accounts
+• `custom` - Any SMTP server
+
+📋 **Use `configure_email` tool to get started!**"""
+)]
+
+_EMAIL_DISABLED_REPLY = [types.TextContent(
+    type="text",
+    text="""📧 **Email Notifications Disabled**
+
+✅ Email notifications have been turned off.
+
+**What happens now:**
+• Stock alerts will still be monitored and logged
+• No emails will be sent when alerts trigger
+• Email configuration is preserved
+• You can re-enable anytime with `enable_email`
+
+💡 **Your alerts continue working** - they just won't send emails until you re-enable notifications."""
+)]
+
+_EMAIL_DISABLE_FAILED_REPLY = [types.TextContent(
+    type="text",
+    text="❌ **Failed to disable email notifications**. Email may not be configured."
+)]
+
+_NO_EMAIL_CONFIG_REPLY = [types.TextContent(
+    type="text",
+    text="""❌ **No Email Configuration Found**
+
+Please configure your email settings first using the `configure_email` tool.
+
+💡 **Quick Setup:**
+```json
+{
+  "provider": "gmail",
+  "username": "your-email@gmail.com",
+  "password": "your-app-password",
+  "to_email": "your-email@gmail.com"
+}
+```"""
+)]
+
+_EMAIL_ENABLED_REPLY = [types.TextContent(
+    type="text",
+    text="""📧 **Email Notifications Enabled**
+
+✅ Email notifications have been turned on.
+
+**What happens now:**
+• Stock alerts continue being monitored
+• Beautiful email notifications will be sent when alerts trigger
+• Emails include price charts and market context
+• Rate limited to prevent spam
+
+🧪 **Test it:** Use `test_email` to verify everything works correctly.
+
+📈 **Set alerts:** Use `set_price_alert` to create stock price alerts that will trigger emails."""
+)]
+
+_EMAIL_ENABLE_FAILED_REPLY = [types.TextContent(
+    type="text",
+    text="❌ **Failed to enable email notifications**. Please check your email configuration is valid."
+)]
+
+
+@dataclass
+class _EmailArgs:
+    """configure_email tool arguments, read once with their defaults applied."""
+    provider: Optional[str] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    to_emails: List[str] = field(default_factory=list)
+    smtp_server: Optional[str] = None
+    smtp_port: int = 587
+    from_email: Optional[str] = None
+    use_tls: bool = True
+
+    @classmethod
+    def from_arguments(cls, arguments: dict) -> '_EmailArgs':
+        """Build from raw tool arguments, folding a single to_email into to_emails."""
+        to_emails = arguments.get("to_emails") or []
+        to_email = arguments.get("to_email")
+        # Handle both single email and multiple emails
+        if to_email and not to_emails:
+            to_emails = [to_email]
+
+        return cls(
+            provider=arguments.get("provider"),
+            username=arguments.get("username"),
+            password=arguments.get("password"),
+            to_emails=to_emails,
+            smtp_server=arguments.get("smtp_server"),
+            smtp_port=arguments.get("smtp_port", 587),
+            from_email=arguments.get("from_email"),
+            use_tls=arguments.get("use_tls", True),
+        )
+
+
+# Serializes configure/enable/disable so their saves and the alert manager
+# reinitialization that follows each one never interleave
+_email_config_lock = asyncio.Lock()
+
+# Provider -> (preset config factory, reply when required fields are missing)
+_EMAIL_PROVIDER_PRESETS = {
+    "gmail": (EmailConfigManager.get_gmail_config, _GMAIL_HELP_REPLY),
+    "outlook": (EmailConfigManager.get_outlook_config, _OUTLOOK_HELP_REPLY),
+}
+
+
+async def handle_configure_email(arguments: dict) -> list[types.TextContent]:
+    """Handle configure email."""
+    try:
+        args = _EmailArgs.from_arguments(arguments)
+
+        if args.provider in _EMAIL_PROVIDER_PRESETS:
+            preset_config, help_reply = _EMAIL_PROVIDER_PRESETS[args.provider]
+            if not (args.username and args.password and args.to_emails):
+                return help_reply
+
+            config = preset_config(
+                # Use first email for compatibility
+                args.username, args.password, args.to_emails[0])
+            # Override with multiple emails
+            config.to_emails = args.to_emails
+
+        else:
+            # Custom configuration
+            if not (args.smtp_server and args.username and args.password
+                    and args.from_email and args.to_emails):
+                return _CUSTOM_EMAIL_HELP_REPLY
+
             config = EmailConfig(
-                smtp_server=smtp_server,
-                smtp_port=smtp_port,
-                username=username,
-                password=password,
-                from_email=from_email,
-                to_emails=to_emails,  # Updated to use to_emails
-                use_tls=use_tls,
+                smtp_server=args.smtp_server,
+                smtp_port=args.smtp_port,
+                username=args.username,
+                password=args.password,
+                from_email=args.from_email,
+                to_emails=args.to_emails,
+                use_tls=args.use_tls,
                 enabled=True
             )
 
         # Validate configuration
         if not config.validate():
-            return [types.TextContent(
-                type="text",
-                text="❌ **Invalid Email Configuration**\n\nPlease check that all email fields are properly formatted and SMTP port is valid."
-            )]
+            return _INVALID_EMAIL_CONFIG_REPLY
 
-        # Save configuration
-        success = email_config_manager.save_config(config)
+        # Save configuration (the file is written off the event loop)
+        global alert_manager
+        async with _email_config_lock:
+            success = await email_config_manager.save_config_async(config)
 
-        if success:
             # Reinitialize email service in alert manager
-            global alert_manager
-            if alert_manager:
+            if success and alert_manager:
                 alert_manager._initialize_email_service()
 
+        if success:
             return [types.TextContent(
                 type="text",
                 text=f"""✅ **Email Configuration Saved Successfully**
 
 **SMTP Server:** {config.smtp_server}:{config.smtp_port}
 **From:** {config.from_email}
-**To:** {', '.join(config.to_emails)}
+**To:** {config.to_emails_display}
 **TLS:** {'Enabled' if config.use_tls else 'Disabled'}
 **Status:** {'Enabled' if config.enabled else 'Disabled'}
 
@@ -1834,10 +2091,7 @@ Multiple recipients:
 📧 **Email notifications are now enabled for all triggered stock alerts.**"""
             )]
         else:
-            return [types.TextContent(
-                type="text",
-                text="❌ **Failed to save email configuration**. Please check the error logs."
-            )]
+            return _EMAIL_SAVE_FAILED_REPLY
 
     except Exception as e:
         logger.error(f"Error configuring email: {e}")
@@ -1850,26 +2104,8 @@ Multiple recipients:
 async def handle_test_email(arguments: dict) -> list[types.TextContent]:
     """Handle test email."""
     try:
-        from .email_config import email_config_manager
-        from .email_service import EmailService
-
         if not email_config_manager.is_configured():
-            return [types.TextContent(
-                type="text",
-                text="""❌ **Email Not Configured**
-
-Please configure your email settings first using the `configure_email` tool.
-
-💡 **Quick Setup:**
-```json
-{
-  "provider": "gmail",
-  "username": "your-email@gmail.com",
-  "password": "your-app-password",
-  "to_email": "your-email@gmail.com"
-}
-```"""
-            )]
+            return _EMAIL_NOT_CONFIGURED_REPLY
 
         config = email_config_manager.get_config()
         email_service = EmailService(
@@ -1882,33 +2118,20 @@ Please configure your email settings first using the `configure_email` tool.
             use_tls=config.use_tls
         )
 
-        # Test SMTP connection first
-        if not email_service.test_connection():
-            return [types.TextContent(
-                type="text",
-                text="""❌ **SMTP Connection Failed**
-
-Unable to connect to the email server. Please check:
-• SMTP server address and port
-• Username and password
-• Internet connectivity
-• Firewall settings
-
-💡 **Common Issues:**
-• Gmail: Make sure you're using an App Password, not your regular password
-• Outlook: Verify your account credentials
-• Corporate email: Check if SMTP is allowed"""
-            )]
-
-        # Send test email
-        success = await email_service.send_test_email()
+        # Sending exercises the connection too, so a dial or login failure
+        # surfaces here instead of needing a separate test_connection() round trip
+        try:
+            success = await email_service.send_test_email(raise_connection_errors=True)
+        except SMTP_CONNECTION_ERRORS as e:
+            logger.error(f"SMTP connection test failed: {e}")
+            return _SMTP_CONNECTION_FAILED_REPLY
 
         if success:
             return [types.TextContent(
                 type="text",
                 text=f"""✅ **Test Email Sent Successfully!**
 
-📧 **Check your inbox:** {', '.join(config.to_emails)}
+📧 **Check your inbox:** {config.to_emails_display}
 
 The test email should arrive within a few minutes. If you don't see it, check your spam folder.
 
@@ -1920,17 +2143,7 @@ The test email should arrive within a few minutes. If you don't see it, check yo
 • Monitor status with `email_status` and `alert_status`"""
             )]
         else:
-            return [types.TextContent(
-                type="text",
-                text="""❌ **Test Email Failed**
-
-The email configuration appears correct, but sending failed. Please check:
-• Email provider settings
-• Rate limiting
-• Account restrictions
-
-💡 Try the test again in a few minutes."""
-            )]
+            return _TEST_EMAIL_FAILED_REPLY
 
     except Exception as e:
         logger.error(f"Error testing email: {e}")
@@ -1943,34 +2156,10 @@ The email configuration appears correct, but sending failed. Please check:
 async def handle_email_status(arguments: dict) -> list[types.TextContent]:
     """Handle email status."""
     try:
-        from .email_config import email_config_manager
-
         status = email_config_manager.get_status()
 
         if not status['configured']:
-            return [types.TextContent(
-                type="text",
-                text="""📧 **Email Status: Not Configured**
-
-Email notifications are not set up yet.
-
-🚀 **Quick Setup:**
-```json
-{
-  "provider": "gmail",
-  "username": "your-email@gmail.com",
-  "password": "your-app-password",
-  "to_email": "your-email@gmail.com"
-}
-```
-
-💡 **Available Providers:**
-• `gmail` - Easy setup with App Password
-• `outlook` - Outlook/Hotmail accounts
-• `custom` - Any SMTP server
-
-📋 **Use `configure_email` tool to get started!**"""
-            )]
+            return _EMAIL_STATUS_NOT_CONFIGURED_REPLY
 
         status_emoji = "✅" if status['enabled'] and status['valid'] else "⚠️"
         config_emoji = "🟢" if status['valid'] else "🔴"
@@ -1980,7 +2169,7 @@ Email notifications are not set up yet.
 **Configuration:** {config_emoji}
 • **SMTP Server:** {status['smtp_server']}:{status['smtp_port']}
 • **From Email:** {status['from_email']}
-• **To Emails:** {', '.join(status['to_emails'])}
+• **To Emails:** {status['to_emails_display']}
 • **TLS Encryption:** {'Enabled' if status['use_tls'] else 'Disabled'}
 • **Valid Config:** {'Yes' if status['valid'] else 'No'}
 • **Notifications:** {'Active' if status['enabled'] else 'Paused'}
@@ -2009,35 +2198,19 @@ Email notifications are not set up yet.
 async def handle_disable_email(arguments: dict) -> list[types.TextContent]:
     """Handle disable email."""
     try:
-        from .email_config import email_config_manager
+        global alert_manager
+        async with _email_config_lock:
+            prev_config = email_config_manager.get_config()
+            success = await email_config_manager.set_enabled_async(False)
 
-        success = email_config_manager.disable_email()
+            # Only the enabled flag changed, so the alert manager can keep its service
+            if success and alert_manager:
+                alert_manager._initialize_email_service(prev_config)
 
         if success:
-            # Reinitialize email service in alert manager
-            global alert_manager
-            if alert_manager:
-                alert_manager._initialize_email_service()
-
-            return [types.TextContent(
-                type="text",
-                text="""📧 **Email Notifications Disabled**
-
-✅ Email notifications have been turned off.
-
-**What happens now:**
-• Stock alerts will still be monitored and logged
-• No emails will be sent when alerts trigger
-• Email configuration is preserved
-• You can re-enable anytime with `enable_email`
-
-💡 **Your alerts continue working** - they just won't send emails until you re-enable notifications."""
-            )]
+            return _EMAIL_DISABLED_REPLY
         else:
-            return [types.TextContent(
-                type="text",
-                text="❌ **Failed to disable email notifications**. Email may not be configured."
-            )]
+            return _EMAIL_DISABLE_FAILED_REPLY
 
     except Exception as e:
         logger.error(f"Error disabling email: {e}")
@@ -2050,55 +2223,22 @@ async def handle_disable_email(arguments: dict) -> list[types.TextContent]:
 async def handle_enable_email(arguments: dict) -> list[types.TextContent]:
     """Handle enable email."""
     try:
-        from .email_config import email_config_manager
-
         if not email_config_manager.get_config():
-            return [types.TextContent(
-                type="text",
-                text="""❌ **No Email Configuration Found**
+            return _NO_EMAIL_CONFIG_REPLY
 
-Please configure your email settings first using the `configure_email` tool.
-
-💡 **Quick Setup:**
-```json
-{
-  "provider": "gmail",
-  "username": "your-email@gmail.com",
-  "password": "your-app-password",
-  "to_email": "your-email@gmail.com"
-}
-```"""
-            )]
+        global alert_manager
+        async with _email_config_lock:
+            prev_config = email_config_manager.get_config()
+            success = await email_config_manager.set_enabled_async(True)
 
-        success = email_config_manager.enable_email()
+            # Only the enabled flag changed, so the alert manager can keep its service
+            if success and alert_manager:
+                alert_manager._initialize_email_service(prev_config)
 
         if success:
-            # Reinitialize email service in alert manager
-            global alert_manager
-            if alert_manager:
-                alert_manager._initialize_email_service()
-
-            return [types.TextContent(
-                type="text",
-                text="""📧 **Email Notifications Enabled**
-
-✅ Email notifications have been turned on.
-
-**What happens now:**
-• Stock alerts continue being monitored
-• Beautiful email notifications will be sent when alerts trigger
-• Emails include price charts and market context
-• Rate limited to prevent spam
-
-🧪 **Test it:** Use `test_email` to verify everything works correctly.
-
-📈 **Set alerts:** Use `set_price_alert` to create stock price alerts that will trigger emails."""
-            )]
+            return _EMAIL_ENABLED_REPLY
         else:
-            return [types.TextContent(
-                type="text",
-                text="❌ **Failed to enable email notifications**. Please check your email configuration is valid."
-            )]
+            return _EMAIL_ENABLE_FAILED_REPLY
 
     except Exception as e:
         logger.error(f"Error enabling email: {e}")
@@ -2108,27 +2248,68 @@ Please configure your email settings first using the `configure_email` tool.
         )]
 
 
+# Tool name -> handler dispatch table
+_HANDLERS: Dict[str, Callable[[dict], Awaitable[list[types.TextContent]]]] = {
+    "buy_stock": handle_buy_stock,
+    "sell_stock": handle_sell_stock,
+    "get_stock_price": handle_get_stock_price,
+    "get_portfolio": handle_get_portfolio,
+    "get_holdings": handle_get_holdings,
+    "get_orders": handle_get_orders,
+    "cancel_order": handle_cancel_order,
+    "search_stocks": handle_search_stocks,
+    "get_market_status": handle_get_market_status,
+    "parse_trade_command": handle_parse_trade_command,
+    "set_price_alert": handle_set_price_alert,
+    "list_alerts": handle_list_alerts,
+    "remove_alert": handle_remove_alert,
+    "check_alerts": handle_check_alerts,
+    "alert_status": handle_alert_status,
+    "configure_email": handle_configure_email,
+    "test_email": handle_test_email,
+    "email_status": handle_email_status,
+    "disable_email": handle_disable_email,
+    "enable_email": handle_enable_email,
+}
+
+
 async def main():
     """Main entry point for the server."""
-    global alert_manager
-
-    # Initialize alert manager with a GrowwClient instance
-    # Create a standalone client for the alert manager
-    groww_client = GrowwClient()
-    alert_manager = AlertManager(groww_client)
+    global alert_manager, _CONFIG_ERROR_MSG
+
+    # Configuration doesn't change while the server runs, so validate it once
+    if not config.validate():
+        _CONFIG_ERROR_MSG = _build_config_error_message(
+            config.get_validation_errors())
+        logger.error("Invalid configuration - tool calls will report the errors")
+    else:
+        # Initialize alert manager with the shared GrowwClient instance
+        try:
+            groww_client = await get_client()
+        except GrowwAPIError as e:
+            _CONFIG_ERROR_MSG = _build_config_error_message([str(e)])
+            logger.error(f"Groww client unavailable - tool calls will report the error: {e}")
+        else:
+            alert_manager = AlertManager(groww_client)
 
-    # Start background monitoring with smart market-aware intervals
-    alert_manager.start_monitoring()  # Will automatically use market-aware intervals
+            # Start background monitoring with smart market-aware intervals
+            alert_manager.start_monitoring()  # Will automatically use market-aware intervals
 
-    logger.info("Alert manager initialized with market-aware monitoring")
+            logger.info("Alert manager initialized with market-aware monitoring")
 
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    finally:
+        close_pooled_connections()
 
 
 if __name__ == "__main__":
+    # uvloop's libuv-based event loop is faster than the default one
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
     asyncio.run(main())
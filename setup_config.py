@@ -4,6 +4,16 @@ Setup Configuration for Groww MCP Server
 """
 
 import os
+import sys
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _load_groww_config():
+    """Import the package configuration once, making this checkout importable first."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from groww_mcp_server.config import config
+    return config
 
 
 def setup_config():
@@ -13,18 +23,16 @@ def setup_config():
     print("=" * 50)
 
     # Check current status
-    current_token = os.getenv("GROWW_ACCESS_TOKEN", "")
+    has_token = bool(os.environ.get("GROWW_ACCESS_TOKEN"))
 
-    if current_token:
-        print(f"✅ Current token: {current_token[:20]}..." + "*" * 20)
+    if has_token:
+        print(f"✅ Current token: {os.environ['GROWW_ACCESS_TOKEN'][:20]}..." + "*" * 20)
         print("✅ Configuration appears to be set!")
 
         # Test the configuration
         print("\n🧪 Testing configuration...")
         try:
-            import sys
-            sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-            from groww_mcp_server.config import config
+            config = _load_groww_config()
 
             if config.validate():
                 print("✅ Configuration is valid!")
@@ -32,9 +40,8 @@ def setup_config():
                 print("\n💡 Try running this command in Claude/Cursor:")
                 print("   'alert me when Waaree Energies stock goes up above 2943'")
             else:
-                errors = config.get_validation_errors()
                 print("❌ Configuration errors:")
-                for error in errors:
+                for error in config.get_validation_errors():
                     print(f"   • {error}")
 
         except Exception as e:
@@ -64,7 +71,7 @@ def setup_config():
     print("✅ Dynamic stock search: WORKING PERFECTLY")
     print("✅ Alert creation: WORKING PERFECTLY")
     print("✅ Market-aware monitoring: WORKING PERFECTLY")
-    print(f"{'✅' if current_token else '❌'} API Configuration: {'READY' if current_token else 'NEEDS SETUP'}")
+    print(f"{'✅' if has_token else '❌'} API Configuration: {'READY' if has_token else 'NEEDS SETUP'}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""
+Tests for the _ttl_cache decorator used by the server's read-only tools.
+"""
+
+import asyncio
+
+import pytest
+
+from groww_mcp_server.server import _ttl_cache
+
+
+def _make_cached():
+    """Build a cached function whose calls block until release is set."""
+    calls = []
+    release = asyncio.Event()
+
+    @_ttl_cache(seconds=60)
+    async def fetch(key):
+        calls.append(key)
+        await release.wait()
+        return f"{key}-{len(calls)}"
+
+    return fetch, calls, release
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    fetch, calls, release = _make_cached()
+
+    callers = [asyncio.ensure_future(fetch("a")) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert calls == ["a"]
+    assert results == ["a-1"] * 5
+    assert await fetch("a") == "a-1"
+
+
+@pytest.mark.asyncio
+async def test_cache_clear_during_call_does_not_store_stale_result():
+    fetch, calls, release = _make_cached()
+
+    caller = asyncio.ensure_future(fetch("a"))
+    await asyncio.sleep(0)
+    fetch.cache_clear()
+    release.set()
+
+    # The in-flight caller still gets its result, but it isn't cached
+    assert await caller == "a-1"
+    assert await fetch("a") == "a-2"
+    assert calls == ["a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    fetch, calls, release = _make_cached()
+
+    cancelled = asyncio.ensure_future(fetch("a"))
+    waiting = asyncio.ensure_future(fetch("a"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiting == "a-1"
+    assert cancelled.cancelled()
+    assert calls == ["a"]